@@ -0,0 +1 @@
+from bdd_runner.steps import given, step, then, when
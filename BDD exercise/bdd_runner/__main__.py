@@ -0,0 +1,44 @@
+import argparse
+import sys
+import time
+
+from bdd_runner.gherkin import GherkinParseException
+from bdd_runner.runner import RunReport, StaticSite, check_steps_defined, collect_scenarios, run, write_report
+from bdd_runner.steps import AmbiguousStepException, UndefinedStepException
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="bdd_runner", description="Run Gherkin features in parallel browsers")
+    parser.add_argument("paths", nargs="*", default=["features"], help="Feature files or directories")
+    parser.add_argument("--steps", default="features/steps", help="Directory with the step definition modules")
+    site = parser.add_mutually_exclusive_group()
+    site.add_argument("--base-url", help="URL of the site under test")
+    site.add_argument("--site", default="site", help="Directory served locally as the site under test")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each one with its own browser")
+    parser.add_argument("--tags", nargs="*", help="Only run scenarios with one of these tags")
+    parser.add_argument("--browser", default="bdd_runner.browser:chrome", help="module:function browser factory")
+    parser.add_argument("--report", help="Write the results and step timings to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = collect_scenarios(args.paths, args.tags)
+        check_steps_defined(scenarios, args.steps)
+    except (GherkinParseException, UndefinedStepException, AmbiguousStepException) as error:
+        parser.error(str(error))
+    report = RunReport()
+    started = time.perf_counter()
+    if args.base_url:
+        report.results.extend(run(scenarios, args.steps, args.base_url, args.workers, args.browser))
+    else:
+        with StaticSite(args.site) as static_site:
+            report.results.extend(run(scenarios, args.steps, static_site.url, args.workers, args.browser))
+    report.duration = time.perf_counter() - started
+    report.results.sort(key=lambda result: result.scenario_id)
+    print(report.format())
+    if args.report:
+        write_report(report, args.report)
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
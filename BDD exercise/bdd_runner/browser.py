@@ -0,0 +1,133 @@
+import importlib
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+STORAGE_SNAPSHOT_SCRIPT = """
+const copy = (storage) => Object.fromEntries(Object.keys(storage).map((key) => [key, storage.getItem(key)]));
+return {local: copy(window.localStorage), session: copy(window.sessionStorage)};
+"""
+
+STORAGE_RESTORE_SCRIPT = """
+const [local, session] = arguments;
+window.localStorage.clear();
+window.sessionStorage.clear();
+Object.entries(local).forEach(([key, value]) => window.localStorage.setItem(key, value));
+Object.entries(session).forEach(([key, value]) => window.sessionStorage.setItem(key, value));
+"""
+
+
+STORAGE_CLEAR_SCRIPT = """
+window.localStorage.clear();
+window.sessionStorage.clear();
+"""
+
+
+def chrome(headless: bool = True):
+    """
+    Default browser factory, a Chrome WebDriver
+    Args:
+        headless (bool): Run the browser without a window
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,900")
+    return webdriver.Chrome(options=options)
+
+
+def load_factory(path: str) -> Callable:
+    """
+    Get a browser factory from its "module:function" path. Factories are passed by path so worker processes
+    can build their own browser whatever the multiprocessing start method
+    """
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+@dataclass
+class BrowserState:
+    """
+    Cookies, local and session storage and URL of the browser, taken after a feature Background ran
+    """
+    url: str
+    cookies: List[dict] = field(default_factory=list)
+    local_storage: dict = field(default_factory=dict)
+    session_storage: dict = field(default_factory=dict)
+
+    @classmethod
+    def capture(cls, browser) -> "BrowserState":
+        storage = browser.execute_script(STORAGE_SNAPSHOT_SCRIPT)
+        return cls(
+            url=browser.current_url,
+            cookies=browser.get_cookies(),
+            local_storage=storage["local"],
+            session_storage=storage["session"],
+        )
+
+    def restore(self, browser):
+        """
+        Put the browser back in the captured state. Storage can only be written on the page origin,
+        so the captured URL is opened first and reloaded once cookies and storage are in place
+        """
+        browser.get(self.url)
+        browser.delete_all_cookies()
+        for cookie in self.cookies:
+            browser.add_cookie(cookie)
+        browser.execute_script(STORAGE_RESTORE_SCRIPT, self.local_storage, self.session_storage)
+        browser.get(self.url)
+
+
+def clear_browser(browser, url: str):
+    """
+    Remove the cookies, local and session storage left by the previous scenario. Storage can only be cleared on
+    the page origin, so the site URL is opened first
+    """
+    browser.get(url)
+    browser.delete_all_cookies()
+    browser.execute_script(STORAGE_CLEAR_SCRIPT)
+
+
+class BrowserPool:
+    """
+    Browsers of a worker process, created on first use and reused by every scenario the worker runs
+    """
+
+    def __init__(self, factory: Callable):
+        self.factory = factory
+        self._idle = []
+        self._all = []
+
+    def acquire(self):
+        if self._idle:
+            return self._idle.pop()
+        browser = self.factory()
+        self._all.append(browser)
+        return browser
+
+    def release(self, browser):
+        self._idle.append(browser)
+
+    def discard(self, browser):
+        """
+        Quit a browser left in an unusable state, the next acquire creates a new one
+        """
+        self._all.remove(browser)
+        _quit(browser)
+
+    def close(self):
+        for browser in self._all:
+            _quit(browser)
+        self._all = []
+        self._idle = []
+
+
+def _quit(browser):
+    try:
+        browser.quit()
+    except Exception as error:
+        logger.debug(f"Browser could not be closed: {error}")
@@ -0,0 +1,189 @@
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+STEP_KEYWORDS = ("Given", "When", "Then", "And", "But", "*")
+OUTLINE_PARAMETER = re.compile(r"<([^<>]+)>")
+
+
+class GherkinParseException(Exception):
+    pass
+
+
+@dataclass
+class Step:
+    keyword: str
+    step_type: str
+    text: str
+    line: int
+    table: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    name: str
+    feature_path: str
+    line: int
+    steps: List[Step]
+    tags: List[str] = field(default_factory=list)
+    example: dict = field(default_factory=dict)
+    background: List[Step] = field(default_factory=list)
+
+    @property
+    def id(self) -> str:
+        suffix = f" [{', '.join(f'{key}={value}' for key, value in self.example.items())}]" if self.example else ""
+        return f"{self.feature_path}:{self.line} {self.name}{suffix}"
+
+
+@dataclass
+class Feature:
+    name: str
+    path: str
+    background: List[Step]
+    scenarios: List[Scenario]
+    tags: List[str] = field(default_factory=list)
+
+
+def _table_row(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip()[1:-1].split("|")]
+
+
+def _substitute(text: str, example: dict) -> str:
+    return OUTLINE_PARAMETER.sub(lambda match: example.get(match.group(1), match.group(0)), text)
+
+
+def _expand_outline(
+        name: str,
+        path: str,
+        line: int,
+        steps: List[Step],
+        tags: List[str],
+        examples: List[Tuple[dict, List[str]]]
+) -> List[Scenario]:
+    """
+    Build one scenario per Examples row. Each scenario gets the outline tags and the tags of its Examples block
+    """
+    return [
+        Scenario(
+            name=_substitute(name, example),
+            feature_path=path,
+            line=line,
+            steps=[
+                Step(
+                    keyword=step.keyword,
+                    step_type=step.step_type,
+                    text=_substitute(step.text, example),
+                    line=step.line,
+                    table=[[_substitute(cell, example) for cell in row] for row in step.table],
+                )
+                for step in steps
+            ],
+            tags=tags + examples_tags,
+            example=example,
+        )
+        for example, examples_tags in examples
+    ]
+
+
+def parse_feature(path: str | Path) -> Feature:
+    """
+    Parse a Gherkin feature file. Scenario outlines are expanded into one scenario per Examples row.
+    Scenarios inherit the feature tags
+    Args:
+        path (str | Path): Feature file
+    Return:
+        Feature: Background steps and concrete scenarios of the feature
+    """
+    path = str(path)
+    feature_name = None
+    feature_tags: List[str] = []
+    background: List[Step] = []
+    scenarios: List[Scenario] = []
+    tags: List[str] = []
+    current = None
+    previous_type = None
+
+    def close_current():
+        if current is None or current["kind"] == "background":
+            return
+        if current["kind"] == "outline":
+            if current["examples_header"] is None:
+                raise GherkinParseException(f"{path}:{current['line']}: Scenario Outline without Examples")
+            scenarios.extend(
+                _expand_outline(
+                    current["name"], path, current["line"], current["steps"], current["tags"], current["examples"]
+                )
+            )
+        else:
+            scenarios.append(Scenario(current["name"], path, current["line"], current["steps"], current["tags"]))
+
+    for number, raw_line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), 1):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("@"):
+            tags.extend(line.split())
+            continue
+        keyword, _, rest = line.partition(":")
+        keyword = keyword.strip()
+        if keyword == "Feature":
+            feature_name = rest.strip()
+            feature_tags, tags = tags, []
+        elif keyword == "Background":
+            close_current()
+            current = {"kind": "background", "steps": background}
+            previous_type = None
+        elif keyword in ("Scenario", "Example", "Scenario Outline", "Scenario Template"):
+            close_current()
+            current = {
+                "kind": "scenario" if keyword in ("Scenario", "Example") else "outline",
+                "name": rest.strip(),
+                "line": number,
+                "steps": [],
+                "tags": feature_tags + tags,
+                "examples_header": None,
+                "examples": [],
+            }
+            tags = []
+            previous_type = None
+        elif keyword in ("Examples", "Scenarios"):
+            if current is None or current["kind"] != "outline":
+                raise GherkinParseException(f"{path}:{number}: Examples outside a Scenario Outline")
+            current["in_examples"] = True
+            current["examples_header"] = None
+            current["examples_tags"], tags = tags, []
+        elif line.startswith("|"):
+            if current is None:
+                raise GherkinParseException(f"{path}:{number}: Table outside a scenario")
+            row = _table_row(line)
+            if current.get("in_examples"):
+                if current["examples_header"] is None:
+                    current["examples_header"] = row
+                else:
+                    current["examples"].append((dict(zip(current["examples_header"], row)), current["examples_tags"]))
+            elif current["steps"]:
+                current["steps"][-1].table.append(row)
+            else:
+                raise GherkinParseException(f"{path}:{number}: Table without a step")
+        else:
+            step_keyword = next((word for word in STEP_KEYWORDS if line.startswith(f"{word} ")), None)
+            if step_keyword is None and (current is None or not current["steps"]):
+                # Free text description below the Feature or Scenario title
+                continue
+            if step_keyword is None or current is None or current.get("in_examples"):
+                raise GherkinParseException(f"{path}:{number}: Unexpected line: {line}")
+            if step_keyword in ("And", "But", "*"):
+                if previous_type is None:
+                    raise GherkinParseException(f"{path}:{number}: {step_keyword} step without a previous step")
+                step_type = previous_type
+            else:
+                step_type = step_keyword.lower()
+            previous_type = step_type
+            current["steps"].append(Step(step_keyword, step_type, line[len(step_keyword):].strip(), number))
+    close_current()
+    if feature_name is None:
+        raise GherkinParseException(f"{path}: No Feature found")
+    for scenario in scenarios:
+        scenario.background = background
+    return Feature(name=feature_name, path=path, background=background, scenarios=scenarios, tags=feature_tags)
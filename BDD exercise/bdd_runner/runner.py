@@ -0,0 +1,187 @@
+import functools
+import json
+import math
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from bdd_runner.gherkin import Scenario, parse_feature
+from bdd_runner.steps import UndefinedStepException, load_step_modules
+from bdd_runner.worker import PASSED, SKIPPED, ScenarioResult, initialize, run_scenario
+
+
+@dataclass
+class RunReport:
+    results: List[ScenarioResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return all(result.status == PASSED for result in self.results)
+
+    def step_timings(self) -> Dict[str, dict]:
+        """
+        Durations of the executed steps grouped by step definition
+        Return:
+            dict: count, total, p50, p95 and max seconds per step definition pattern
+        """
+        durations = defaultdict(list)
+        for result in self.results:
+            for step in result.steps:
+                if step.status != SKIPPED and step.definition is not None:
+                    durations[step.definition].append(step.duration)
+        return {
+            definition: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "max": max(values),
+            }
+            for definition, values in sorted(durations.items(), key=lambda item: -sum(item[1]))
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "duration": self.duration,
+            "passed": self.passed,
+            "scenarios": [asdict(result) for result in self.results],
+            "step_timings": self.step_timings(),
+        }
+
+    def format(self) -> str:
+        lines = []
+        for result in self.results:
+            lines.append(f"{result.status.upper():7} {result.duration:7.3f}s  {result.scenario_id}")
+            for step in result.steps:
+                if step.status != PASSED:
+                    lines.append(f"        {step.status:7} {step.keyword} {step.text}")
+                    if step.error:
+                        lines.extend(f"            {line}" for line in step.error.rstrip().splitlines())
+        counts = defaultdict(int)
+        for result in self.results:
+            counts[result.status] += 1
+        lines.append("")
+        lines.append(
+            f"{len(self.results)} scenarios ({', '.join(f'{count} {status}' for status, count in counts.items())})"
+            f" in {self.duration:.3f}s, background reused in "
+            f"{sum(result.background_reused for result in self.results)}"
+        )
+        lines.append("")
+        lines.append(f"{'count':>6} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8}  step")
+        for definition, timing in self.step_timings().items():
+            lines.append(
+                f"{timing['count']:>6} {timing['total']:>8.3f}s {timing['p50']:>7.3f}s {timing['p95']:>7.3f}s "
+                f"{timing['max']:>7.3f}s  {definition}"
+            )
+        return "\n".join(lines)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def collect_scenarios(paths: List[str | Path], tags: List[str] = None) -> List[Scenario]:
+    """
+    Parse the feature files, searching directories recursively
+    Args:
+        paths (list): Feature files or directories
+        tags (list): Only keep scenarios with one of these tags, all of them if None
+    Return:
+        list: Concrete scenarios, outlines expanded
+    """
+    scenarios = []
+    for path in map(Path, paths):
+        for feature_path in sorted(path.rglob("*.feature")) if path.is_dir() else [path]:
+            scenarios.extend(parse_feature(feature_path).scenarios)
+    if tags:
+        scenarios = [scenario for scenario in scenarios if set(tags) & set(scenario.tags)]
+    return scenarios
+
+
+def check_steps_defined(scenarios: List[Scenario], steps_directory: str | Path):
+    """
+    Fail before starting any browser if a step has no definition
+    """
+    matcher = load_step_modules(steps_directory).compile()
+    matcher.check_ambiguous()
+    undefined = set()
+    for scenario in scenarios:
+        for step in scenario.background + scenario.steps:
+            try:
+                matcher.match(step.step_type, step.text)
+            except UndefinedStepException:
+                undefined.add(f"{step.keyword} {step.text}")
+    if undefined:
+        raise UndefinedStepException("Undefined steps:\n" + "\n".join(sorted(undefined)))
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticSite:
+    """
+    Local stand-in site served with http.server on a free port, to run the features offline
+    """
+
+    def __init__(self, directory: str | Path):
+        handler = functools.partial(QuietRequestHandler, directory=str(Path(directory).resolve()))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StaticSite":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run(
+        scenarios: List[Scenario],
+        steps_directory: str | Path,
+        base_url: str,
+        workers: int = 1,
+        browser_factory: str = "bdd_runner.browser:chrome",
+) -> Iterator[ScenarioResult]:
+    """
+    Run scenarios across worker processes, each one with its own browser
+    Args:
+        scenarios (list): Scenarios to run
+        steps_directory (str | Path): Directory with the step definition modules
+        base_url (str): URL of the site under test
+        workers (int): Number of worker processes, and browsers
+        browser_factory (str): "module:function" creating a browser in each worker
+    Return:
+        Iterator[ScenarioResult]: Scenario results, in completion order
+    """
+    # Scenarios of the same feature are submitted together so each worker tends to reuse the Background
+    # state it already captured
+    ordered = sorted(scenarios, key=lambda scenario: scenario.feature_path)
+    with ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(ordered))),
+            initializer=initialize,
+            initargs=(str(steps_directory), browser_factory, base_url),
+    ) as executor:
+        futures = [executor.submit(run_scenario, scenario) for scenario in ordered]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_report(report: RunReport, path: str | Path):
+    Path(path).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
@@ -0,0 +1,200 @@
+import importlib.util
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PLACEHOLDER = re.compile(r"\{(\w+)(?::(\w))?}")
+PLACEHOLDER_GROUP = re.compile(r"\(\?P<(\w+)>")
+PLACEHOLDER_PATTERNS = {None: r".+?", "d": r"-?\d+", "f": r"-?\d+(?:\.\d+)?", "w": r"\w+"}
+PLACEHOLDER_CONVERTERS = {None: str, "d": int, "f": float, "w": str}
+STEP_TYPES = ("given", "when", "then")
+
+
+class UndefinedStepException(Exception):
+    pass
+
+
+class AmbiguousStepException(Exception):
+    pass
+
+
+@dataclass
+class StepDefinition:
+    step_type: str
+    pattern: str
+    function: Callable
+    regex: str
+    converters: Dict[str, Callable]
+
+    @property
+    def location(self) -> str:
+        code = self.function.__code__
+        return f"{Path(code.co_filename).name}:{code.co_firstlineno}"
+
+
+def _compile_pattern(pattern: str) -> Tuple[str, Dict[str, Callable]]:
+    converters = {}
+    regex = []
+    position = 0
+    for placeholder in PLACEHOLDER.finditer(pattern):
+        name, kind = placeholder.groups()
+        if kind not in PLACEHOLDER_PATTERNS:
+            raise ValueError(f"Unknown placeholder type '{kind}' in step '{pattern}'")
+        regex.append(re.escape(pattern[position:placeholder.start()]))
+        regex.append(f"(?P<{name}>{PLACEHOLDER_PATTERNS[kind]})")
+        converters[name] = PLACEHOLDER_CONVERTERS[kind]
+        position = placeholder.end()
+    regex.append(re.escape(pattern[position:]))
+    return "".join(regex), converters
+
+
+class StepRegistry:
+    """
+    Step definitions of the loaded step modules. Placeholders in the patterns ({name}, {name:d}, {name:f},
+    {name:w}) become keyword arguments of the step function
+    """
+
+    def __init__(self):
+        self.definitions: List[StepDefinition] = []
+        self.loaded_modules = set()
+
+    def register(self, step_type: str, pattern: str) -> Callable:
+        def decorator(function: Callable) -> Callable:
+            regex, converters = _compile_pattern(pattern)
+            self.definitions.append(StepDefinition(step_type, pattern, function, regex, converters))
+            return function
+        return decorator
+
+    def compile(self) -> "StepMatcher":
+        return StepMatcher(self.definitions)
+
+
+def _index_key(pattern: str) -> Tuple[int, str] | None:
+    """
+    Index key of a step pattern: its first two words, or its first word, when they are literal
+    """
+    words = pattern.split("{", 1)[0].split(" ")[:-1]
+    if not words or not words[0]:
+        return None
+    return (2, " ".join(words[:2])) if len(words) >= 2 else (1, words[0])
+
+
+def _text_keys(text: str) -> List[Tuple[int, str] | None]:
+    words = text.split(" ", 2)
+    keys = []
+    if len(words) == 3:
+        keys.append((2, " ".join(words[:2])))
+    if len(words) >= 2:
+        keys.append((1, words[0]))
+    return keys + [None]
+
+
+class StepMatcher:
+    """
+    Step definitions indexed by the literal words their pattern starts with. A step is only tried against the
+    definitions sharing its first two words, its first word, or starting with a placeholder. Each of these
+    buckets is compiled into one alternation regex with a named group per definition: match.lastgroup tells which
+    definition matched and its placeholders are read from prefixed groups.
+    When several definitions match, the first registered one wins
+    """
+
+    def __init__(self, definitions: List[StepDefinition]):
+        self._definitions: Dict[str, StepDefinition] = {}
+        self._groups: Dict[str, Dict[str, str]] = {}
+        self._order: Dict[str, int] = {}
+        buckets: Dict[Tuple[str, Tuple[int, str] | None], List[str]] = defaultdict(list)
+        for index, definition in enumerate(definitions):
+            group = f"step{index}"
+            self._definitions[group] = definition
+            self._order[group] = index
+            self._groups[group] = {f"{group}_{name}": name for name in definition.converters}
+            regex = PLACEHOLDER_GROUP.sub(lambda match: f"(?P<{group}_{match.group(1)}>", definition.regex)
+            step_types = STEP_TYPES if definition.step_type == "step" else (definition.step_type,)
+            for step_type in step_types:
+                buckets[(step_type, _index_key(definition.pattern))].append(f"(?P<{group}>{regex})")
+        self._index = {key: re.compile(f"^(?:{'|'.join(patterns)})$") for key, patterns in buckets.items()}
+
+    @lru_cache(maxsize=4096)
+    def match(self, step_type: str, text: str) -> Tuple[StepDefinition, Dict[str, object]]:
+        """
+        Find the step definition for a step
+        Args:
+            step_type (str): given, when or then
+            text (str): Step text, without its keyword
+        Return:
+            tuple: Step definition and the keyword arguments to call it with
+        """
+        matches = [
+            match
+            for match in (
+                self._index[(step_type, key)].match(text)
+                for key in _text_keys(text)
+                if (step_type, key) in self._index
+            )
+            if match is not None
+        ]
+        if not matches:
+            raise UndefinedStepException(f"Undefined step: {step_type.capitalize()} {text}")
+        match = min(matches, key=lambda candidate: self._order[candidate.lastgroup])
+        definition = self._definitions[match.lastgroup]
+        arguments = {
+            name: definition.converters[name](match.group(group))
+            for group, name in self._groups[match.lastgroup].items()
+        }
+        return definition, arguments
+
+    def check_ambiguous(self):
+        """
+        Raise if two definitions of the same step type have the same pattern, the second one could never match
+        """
+        for step_type in STEP_TYPES:
+            seen = {}
+            for definition in self._definitions.values():
+                if definition.step_type not in (step_type, "step"):
+                    continue
+                if definition.regex in seen:
+                    raise AmbiguousStepException(
+                        f"Step '{definition.pattern}' at {definition.location} is already defined at "
+                        f"{seen[definition.regex].location}"
+                    )
+                seen[definition.regex] = definition
+
+
+registry = StepRegistry()
+
+
+def given(pattern: str) -> Callable:
+    return registry.register("given", pattern)
+
+
+def when(pattern: str) -> Callable:
+    return registry.register("when", pattern)
+
+
+def then(pattern: str) -> Callable:
+    return registry.register("then", pattern)
+
+
+def step(pattern: str) -> Callable:
+    return registry.register("step", pattern)
+
+
+def load_step_modules(steps_directory: str | Path) -> StepRegistry:
+    """
+    Import every Python module of the steps directory, registering their step definitions
+    Args:
+        steps_directory (str | Path): Directory with the step definition modules
+    Return:
+        StepRegistry: Registry holding the loaded definitions
+    """
+    for path in sorted(Path(steps_directory).resolve().glob("*.py")):
+        if path in registry.loaded_modules:
+            continue
+        registry.loaded_modules.add(path)
+        spec = importlib.util.spec_from_file_location(f"bdd_steps.{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return registry
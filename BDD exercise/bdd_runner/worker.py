@@ -0,0 +1,167 @@
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.util import Finalize
+from typing import Dict, List
+
+from bdd_runner.browser import BrowserPool, BrowserState, clear_browser, load_factory
+from bdd_runner.gherkin import Scenario, Step
+from bdd_runner.steps import StepMatcher, UndefinedStepException, load_step_modules
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+class Context:
+    """
+    Object passed to every step function. Holds the browser and the base URL of the site under test,
+    steps can add their own attributes to share values within a scenario
+    """
+
+    def __init__(self, browser, base_url: str, table: List[List[str]] = None):
+        self.browser = browser
+        self.base_url = base_url.rstrip("/")
+        self.table = table or []
+
+    def url(self, path: str = "") -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+
+@dataclass
+class StepResult:
+    keyword: str
+    text: str
+    status: str
+    duration: float
+    definition: str = None
+    error: str = None
+
+
+@dataclass
+class ScenarioResult:
+    scenario_id: str
+    status: str
+    duration: float
+    worker: int
+    steps: List[StepResult] = field(default_factory=list)
+    background_reused: bool = False
+
+
+class Worker:
+    """
+    State of a worker process: its browser pool, the compiled step matcher and the browser state left by each
+    feature Background, so the Background runs once per worker instead of once per scenario
+    """
+
+    def __init__(self, steps_directory: str, browser_factory: str, base_url: str):
+        self.matcher: StepMatcher = load_step_modules(steps_directory).compile()
+        self.pool = BrowserPool(load_factory(browser_factory))
+        self.base_url = base_url
+        self.backgrounds: Dict[str, BrowserState | List[StepResult]] = {}
+
+    def _run_steps(self, context: Context, steps: List[Step]) -> List[StepResult]:
+        results = []
+        failed = False
+        for step in steps:
+            if failed:
+                results.append(StepResult(step.keyword, step.text, SKIPPED, 0.0))
+                continue
+            started = time.perf_counter()
+            definition = None
+            try:
+                definition, arguments = self.matcher.match(step.step_type, step.text)
+                context.table = step.table
+                definition.function(context, **arguments)
+                status, error = PASSED, None
+            except AssertionError as assertion:
+                status, error = FAILED, str(assertion) or traceback.format_exc(limit=-1)
+            except UndefinedStepException as undefined:
+                status, error = ERROR, str(undefined)
+            except Exception:
+                status, error = ERROR, traceback.format_exc(limit=-3)
+            results.append(
+                StepResult(
+                    keyword=step.keyword,
+                    text=step.text,
+                    status=status,
+                    duration=time.perf_counter() - started,
+                    definition=definition.pattern if definition else None,
+                    error=error,
+                )
+            )
+            failed = status != PASSED
+        return results
+
+    def _prepare_background(self, browser, scenario: Scenario) -> List[StepResult] | None:
+        """
+        Restore the feature Background state in the browser, running the Background the first time
+        Return:
+            list | None: Step results of the Background when it ran or failed before, None when its state was restored
+        """
+        if not scenario.background:
+            clear_browser(browser, self.base_url)
+            return []
+        state = self.backgrounds.get(scenario.feature_path)
+        if isinstance(state, BrowserState):
+            state.restore(browser)
+            return None
+        if isinstance(state, list):
+            return state
+        clear_browser(browser, self.base_url)
+        results = self._run_steps(Context(browser, self.base_url), scenario.background)
+        if all(result.status == PASSED for result in results):
+            self.backgrounds[scenario.feature_path] = BrowserState.capture(browser)
+        else:
+            self.backgrounds[scenario.feature_path] = results
+        return results
+
+    def run(self, scenario: Scenario, worker: int) -> ScenarioResult:
+        started = time.perf_counter()
+        browser = self.pool.acquire()
+        try:
+            background = self._prepare_background(browser, scenario)
+            steps = background or []
+            if all(result.status == PASSED for result in steps):
+                steps = steps + self._run_steps(Context(browser, self.base_url), scenario.steps)
+            else:
+                steps = steps + [StepResult(step.keyword, step.text, SKIPPED, 0.0) for step in scenario.steps]
+        except Exception:
+            self.pool.discard(browser)
+            self.backgrounds.clear()
+            return ScenarioResult(
+                scenario_id=scenario.id,
+                status=ERROR,
+                duration=time.perf_counter() - started,
+                worker=worker,
+                steps=[StepResult("", "browser", ERROR, 0.0, error=traceback.format_exc(limit=-3))],
+            )
+        self.pool.release(browser)
+        statuses = {result.status for result in steps}
+        status = ERROR if ERROR in statuses else FAILED if FAILED in statuses else PASSED
+        return ScenarioResult(
+            scenario_id=scenario.id,
+            status=status,
+            duration=time.perf_counter() - started,
+            worker=worker,
+            steps=steps,
+            background_reused=background is None,
+        )
+
+
+_worker: Worker | None = None
+
+
+def initialize(steps_directory: str, browser_factory: str, base_url: str):
+    """
+    Worker process initializer
+    """
+    global _worker
+    _worker = Worker(steps_directory, browser_factory, base_url)
+    Finalize(None, _worker.pool.close, exitpriority=10)
+
+
+def run_scenario(scenario: Scenario) -> ScenarioResult:
+    return _worker.run(scenario, os.getpid())
@@ -0,0 +1,74 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from bdd_runner import given, then, when
+
+TIMEOUT = 5
+
+
+def _wait(context):
+    return WebDriverWait(context.browser, TIMEOUT)
+
+
+@given("I open the store home page")
+def open_home_page(context):
+    context.browser.get(context.url("index.html"))
+
+
+@given("I accept the cookies banner")
+def accept_cookies(context):
+    _wait(context).until(expected_conditions.element_to_be_clickable((By.ID, "accept-cookies"))).click()
+    _wait(context).until(expected_conditions.invisibility_of_element_located((By.ID, "cookie-banner")))
+
+
+@when('I search for "{term}"')
+def search_for(context, term):
+    search_input = context.browser.find_element(By.ID, "search-input")
+    search_input.clear()
+    search_input.send_keys(term)
+    context.browser.find_element(By.ID, "search-button").click()
+    _wait(context).until(expected_conditions.text_to_be_present_in_element((By.ID, "result-count"), "results"))
+
+
+@when("I add result {position:d} to the cart")
+def add_result_to_cart(context, position):
+    results = context.browser.find_elements(By.CSS_SELECTOR, ".result .add-to-cart")
+    assert len(results) >= position, f"Only {len(results)} results, cannot add result {position}"
+    results[position - 1].click()
+
+
+@when("I open the cart")
+def open_cart(context):
+    context.browser.find_element(By.ID, "cart-link").click()
+    _wait(context).until(expected_conditions.title_contains("Cart"))
+
+
+@then("I see {count:d} results")
+def see_results(context, count):
+    titles = context.browser.find_elements(By.CSS_SELECTOR, ".result-title")
+    assert len(titles) == count, f"Expected {count} results, got {len(titles)}"
+
+
+@then('every result title contains "{term}"')
+def every_result_contains(context, term):
+    titles = [element.text for element in context.browser.find_elements(By.CSS_SELECTOR, ".result-title")]
+    unexpected = [title for title in titles if term.lower() not in title.lower()]
+    assert not unexpected, f"Results not matching '{term}': {unexpected}"
+
+
+@then("the cart counter shows {count:d}")
+def cart_counter_shows(context, count):
+    _wait(context).until(expected_conditions.text_to_be_present_in_element((By.ID, "cart-count"), str(count)))
+
+
+@then('the cart lists "{product}"')
+def cart_lists(context, product):
+    items = [element.text for element in context.browser.find_elements(By.CSS_SELECTOR, ".cart-item")]
+    assert product in items, f"'{product}' is not in the cart: {items}"
+
+
+@then("the cart is empty")
+def cart_is_empty(context):
+    items = context.browser.find_elements(By.CSS_SELECTOR, ".cart-item")
+    assert not items, f"Cart is not empty: {[item.text for item in items]}"
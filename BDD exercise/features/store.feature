@@ -0,0 +1,37 @@
+Feature: Product search and cart
+  As a shopper I want to search the store catalog and add products to my cart
+
+  Background:
+    Given I open the store home page
+    And I accept the cookies banner
+
+  @search
+  Scenario Outline: Search results match the search term
+    When I search for "<term>"
+    Then I see <count> results
+    And every result title contains "<term>"
+
+    Examples:
+      | term       | count |
+      | Laptop     | 3     |
+      | Headphones | 2     |
+      | Smart TV   | 2     |
+      | Mouse      | 1     |
+
+  @search
+  Scenario: Searching for a product the store does not sell
+    When I search for "Refrigerator"
+    Then I see 0 results
+
+  @cart
+  Scenario: Add a product to the cart
+    When I search for "Headphones"
+    And I add result 1 to the cart
+    Then the cart counter shows 1
+    When I open the cart
+    Then the cart lists "Sony WH-1000XM5 Wireless Headphones"
+
+  @cart
+  Scenario: The cart starts empty for every scenario
+    When I open the cart
+    Then the cart is empty
@@ -0,0 +1,79 @@
+const PRODUCTS = [
+    {id: 1, title: "Lenovo IdeaPad 3 Laptop 15.6\"", price: 549.99},
+    {id: 2, title: "HP Pavilion Laptop 14\"", price: 629.00},
+    {id: 3, title: "Apple MacBook Air Laptop 13\"", price: 999.00},
+    {id: 4, title: "Sony WH-1000XM5 Wireless Headphones", price: 399.99},
+    {id: 5, title: "JBL Tune 510BT Headphones", price: 49.95},
+    {id: 6, title: "Samsung 55\" 4K Smart TV", price: 479.99},
+    {id: 7, title: "LG 65\" OLED Smart TV", price: 1799.99},
+    {id: 8, title: "Logitech MX Master 3S Mouse", price: 99.99},
+];
+
+const readCart = () => JSON.parse(window.localStorage.getItem("cart") || "[]");
+
+const writeCart = (cart) => {
+    window.localStorage.setItem("cart", JSON.stringify(cart));
+    renderCartCount();
+};
+
+const renderCartCount = () => {
+    const counter = document.getElementById("cart-count");
+    if (counter) {
+        counter.textContent = String(readCart().length);
+    }
+};
+
+const setUpCookieBanner = () => {
+    const banner = document.getElementById("cookie-banner");
+    if (document.cookie.split("; ").includes("cookies_accepted=yes")) {
+        banner.remove();
+        return;
+    }
+    document.getElementById("accept-cookies").addEventListener("click", () => {
+        document.cookie = "cookies_accepted=yes; path=/";
+        banner.remove();
+    });
+};
+
+const renderResults = () => {
+    const query = new URLSearchParams(window.location.search).get("q") || "";
+    document.getElementById("search-input").value = query;
+    const list = document.getElementById("results");
+    const matches = PRODUCTS.filter((product) => product.title.toLowerCase().includes(query.toLowerCase()));
+    // Results show up after a short delay, as they would coming from a search backend
+    setTimeout(() => {
+        document.getElementById("result-count").textContent = `${matches.length} results for "${query}"`;
+        for (const product of matches) {
+            const item = document.createElement("li");
+            item.className = "result";
+            item.innerHTML = `<span class="result-title"></span> <span class="result-price"></span>
+                <button class="add-to-cart">Add to cart</button>`;
+            item.querySelector(".result-title").textContent = product.title;
+            item.querySelector(".result-price").textContent = `$${product.price.toFixed(2)}`;
+            item.querySelector(".add-to-cart").addEventListener("click", () => writeCart([...readCart(), product.id]));
+            list.appendChild(item);
+        }
+    }, 150);
+};
+
+const renderCart = () => {
+    const list = document.getElementById("cart-items");
+    for (const id of readCart()) {
+        const product = PRODUCTS.find((candidate) => candidate.id === id);
+        const item = document.createElement("li");
+        item.className = "cart-item";
+        item.textContent = product.title;
+        list.appendChild(item);
+    }
+};
+
+document.addEventListener("DOMContentLoaded", () => {
+    setUpCookieBanner();
+    renderCartCount();
+    const page = document.body.dataset.page;
+    if (page === "search") {
+        renderResults();
+    } else if (page === "cart") {
+        renderCart();
+    }
+});
@@ -0,0 +1,80 @@
+import pytest
+
+from bdd_runner.gherkin import GherkinParseException, parse_feature
+
+FEATURE = """@store @smoke
+Feature: Store
+  Free text describing the feature
+
+  Background:
+    Given I open the store
+    And I accept the cookies
+
+  @search
+  Scenario Outline: Search for <term>
+    When I search for "<term>"
+    Then I see <count> results
+
+    Examples:
+      | term   | count |
+      | laptop | 3     |
+
+    @slow
+    Examples: Long searches
+      | term       | count |
+      | headphones | 2     |
+
+  Scenario: Cart
+    When I add the items
+      | name   |
+      | laptop |
+    But I do not pay
+"""
+
+
+@pytest.fixture
+def feature(tmp_path):
+    path = tmp_path / "store.feature"
+    path.write_text(FEATURE, encoding="utf-8")
+    return parse_feature(path)
+
+
+def test_outline_is_expanded_per_examples_row(feature):
+    outline = [scenario for scenario in feature.scenarios if scenario.example]
+    assert [scenario.name for scenario in outline] == ["Search for laptop", "Search for headphones"]
+    assert [step.text for step in outline[1].steps] == ['I search for "headphones"', "I see 2 results"]
+    assert outline[0].example == {"term": "laptop", "count": "3"}
+
+
+def test_feature_tags_apply_to_every_scenario(feature):
+    assert feature.tags == ["@store", "@smoke"]
+    assert all({"@store", "@smoke"} <= set(scenario.tags) for scenario in feature.scenarios)
+
+
+def test_examples_tags_apply_only_to_their_block(feature):
+    tags = {scenario.name: scenario.tags for scenario in feature.scenarios}
+    assert tags["Search for laptop"] == ["@store", "@smoke", "@search"]
+    assert tags["Search for headphones"] == ["@store", "@smoke", "@search", "@slow"]
+    assert tags["Cart"] == ["@store", "@smoke"]
+
+
+def test_background_is_attached_to_every_scenario(feature):
+    assert [step.text for step in feature.background] == ["I open the store", "I accept the cookies"]
+    assert all(scenario.background is feature.background for scenario in feature.scenarios)
+
+
+def test_and_but_steps_take_the_previous_step_type(feature):
+    cart = feature.scenarios[-1]
+    assert [(step.keyword, step.step_type) for step in cart.steps] == [("When", "when"), ("But", "when")]
+    assert feature.background[1].step_type == "given"
+
+
+def test_data_table_is_attached_to_its_step(feature):
+    assert feature.scenarios[-1].steps[0].table == [["name"], ["laptop"]]
+
+
+def test_outline_without_examples_is_rejected(tmp_path):
+    path = tmp_path / "broken.feature"
+    path.write_text("Feature: Broken\n  Scenario Outline: Nothing\n    Given <value>\n", encoding="utf-8")
+    with pytest.raises(GherkinParseException, match="without Examples"):
+        parse_feature(path)
@@ -0,0 +1,66 @@
+import pytest
+
+from bdd_runner.steps import AmbiguousStepException, StepRegistry, UndefinedStepException
+
+
+@pytest.fixture
+def registry():
+    registry = StepRegistry()
+
+    @registry.register("when", 'I search for "{term}"')
+    def search(context, term):
+        pass
+
+    @registry.register("then", "I see {count:d} results")
+    def results(context, count):
+        pass
+
+    @registry.register("then", "I see the {name:w} page")
+    def page(context, name):
+        pass
+
+    @registry.register("step", "{amount:f} is charged")
+    def charged(context, amount):
+        pass
+
+    @registry.register("then", "I see {anything}")
+    def anything(context, anything):
+        pass
+
+    return registry
+
+
+def test_placeholders_are_converted(registry):
+    matcher = registry.compile()
+    definition, arguments = matcher.match("then", "I see 3 results")
+    assert definition.pattern == "I see {count:d} results"
+    assert arguments == {"count": 3}
+    assert matcher.match("when", 'I search for "smart tv"')[1] == {"term": "smart tv"}
+
+
+def test_first_registered_definition_wins(registry):
+    matcher = registry.compile()
+    assert matcher.match("then", "I see the cart page")[0].pattern == "I see the {name:w} page"
+    assert matcher.match("then", "I see nothing at all")[0].pattern == "I see {anything}"
+
+
+def test_patterns_starting_with_a_placeholder_match_every_step_type(registry):
+    matcher = registry.compile()
+    for step_type in ("given", "when", "then"):
+        assert matcher.match(step_type, "12.50 is charged")[1] == {"amount": 12.5}
+
+
+def test_step_type_is_part_of_the_match(registry):
+    with pytest.raises(UndefinedStepException):
+        registry.compile().match("given", "I see 3 results")
+
+
+def test_undefined_step(registry):
+    with pytest.raises(UndefinedStepException, match="Undefined step: When I pay"):
+        registry.compile().match("when", "I pay")
+
+
+def test_duplicated_pattern_is_ambiguous(registry):
+    registry.register("then", "I see {count:d} results")(lambda context, count: None)
+    with pytest.raises(AmbiguousStepException):
+        registry.compile().check_ambiguous()
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from bdd_runner.browser import STORAGE_CLEAR_SCRIPT, STORAGE_RESTORE_SCRIPT, STORAGE_SNAPSHOT_SCRIPT, BrowserPool
+from bdd_runner.gherkin import Scenario, Step
+from bdd_runner.steps import StepRegistry
+from bdd_runner.worker import PASSED, Worker
+
+BASE_URL = "http://store.test"
+
+
+class FakeBrowser:
+    """
+    Browser keeping cookies, local and session storage in memory, like a real one reused between scenarios
+    """
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.cookies = []
+        self.local_storage = {}
+        self.session_storage = {}
+
+    def get(self, url):
+        self.current_url = url
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def execute_script(self, script, *args):
+        if script == STORAGE_SNAPSHOT_SCRIPT:
+            return {"local": dict(self.local_storage), "session": dict(self.session_storage)}
+        if script == STORAGE_RESTORE_SCRIPT:
+            self.local_storage, self.session_storage = dict(args[0]), dict(args[1])
+        elif script == STORAGE_CLEAR_SCRIPT:
+            self.local_storage, self.session_storage = {}, {}
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def worker():
+    registry = StepRegistry()
+
+    @registry.register("given", "I add {name} to the cart")
+    def add(context, name):
+        cart = json.loads(context.browser.local_storage.get("cart", "[]"))
+        context.browser.local_storage["cart"] = json.dumps(cart + [name])
+
+    @registry.register("then", "the cart holds {count:d} items")
+    def cart_holds(context, count):
+        assert len(json.loads(context.browser.local_storage.get("cart", "[]"))) == count
+
+    worker = Worker.__new__(Worker)
+    worker.matcher = registry.compile()
+    worker.pool = BrowserPool(FakeBrowser)
+    worker.base_url = BASE_URL
+    worker.backgrounds = {}
+    return worker
+
+
+def _scenario(feature_path, steps, background=()):
+    def step(keyword, text):
+        return Step(keyword, keyword.lower(), text, 1)
+    return Scenario(
+        name=feature_path,
+        feature_path=feature_path,
+        line=1,
+        steps=[step(*entry) for entry in steps],
+        background=[step(*entry) for entry in background],
+    )
+
+
+def test_scenario_without_background_starts_with_empty_storage(worker):
+    worker.run(_scenario("a.feature", [("Given", "I add laptop to the cart")]), worker=1)
+
+    result = worker.run(_scenario("b.feature", [("Then", "the cart holds 0 items")]), worker=1)
+
+    assert result.status == PASSED
+
+
+def test_background_state_does_not_capture_previous_scenario_storage(worker):
+    worker.run(_scenario("a.feature", [("Given", "I add laptop to the cart")]), worker=1)
+    background = [("Given", "I add mouse to the cart")]
+    checks = [("Then", "the cart holds 1 items")]
+
+    first = worker.run(_scenario("b.feature", checks, background), worker=1)
+    second = worker.run(_scenario("b.feature", checks, background), worker=1)
+
+    assert (first.status, first.background_reused) == (PASSED, False)
+    assert (second.status, second.background_reused) == (PASSED, True)
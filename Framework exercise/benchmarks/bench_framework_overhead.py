@@ -0,0 +1,164 @@
+"""
+Framework overhead benchmarks for Pos.pay and to_dict, run against the offline backend so the POS response time
+is not part of the measure. Reports wall time, WebDriver commands and peak allocated memory per operation and
+flags regressions against a JSON baseline.
+
+    python bench_framework_overhead.py                    # compare against baseline.json, fails if it is missing
+    python bench_framework_overhead.py --update-baseline  # record a new baseline
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+from hornets.components.offline_backend import OfflineCard, OfflinePos, build_offline_pos
+from hornets.components.pos.enums import PayMode
+from hornets.components.pos.payment.payment import Payment
+from hornets.components.pos.payment.payment_method import CreditCardPaymentMethod, DebitCardPaymentMethod
+from hornets.components.transaction.transaction_details import TransactionDetails
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+BASKET_SIZES = (1, 10, 50, 200)
+
+
+def _basket(offline: OfflinePos, size: int, price: float = 1.0):
+    offline.simulator.new_transaction()
+    offline.pos.reset()
+    for index in range(size):
+        offline.simulator.catalog[f"Item {index + 1}"] = price
+        offline.pos.select_item(item=f"Item {index + 1}")
+
+
+def _pay(payment_factory: Callable[[], Payment], pay_mode: PayMode = None, price: float = 1.0):
+    def setup(offline: OfflinePos):
+        _basket(offline, 1, price)
+
+    def operation(offline: OfflinePos):
+        offline.pos.pay(payment_factory(), pay_mode=pay_mode)
+    return setup, operation
+
+
+def _to_dict(size: int):
+    def setup(offline: OfflinePos):
+        _basket(offline, size)
+
+    def operation(offline: OfflinePos):
+        offline.pos.transaction.to_dict()
+    return setup, operation
+
+
+def _transaction_details_to_dict():
+    details = TransactionDetails()
+    details.payment_method = (CreditCardPaymentMethod(OfflineCard()),)
+
+    def operation(offline: OfflinePos):
+        details.to_dict()
+    return lambda offline: None, operation
+
+
+def scenarios() -> Dict[str, tuple]:
+    return {
+        "pay_credit_card": _pay(lambda: Payment(CreditCardPaymentMethod(OfflineCard()))),
+        "pay_split_tender": _pay(lambda: Payment(
+            CreditCardPaymentMethod(OfflineCard(approved_limit=0.5), credit_card_limit="0.50"),
+            DebitCardPaymentMethod(OfflineCard()),
+        )),
+        "pay_split_tender_pipelined": _pay(lambda: Payment(
+            CreditCardPaymentMethod(OfflineCard(approved_limit=0.5), credit_card_limit="0.50"),
+            DebitCardPaymentMethod(OfflineCard()),
+            pipelined=True,
+        )),
+        "pay_zero_amount": _pay(lambda: None, pay_mode=PayMode.ZERO_AMOUNT_TRANSACTION, price=0.0),
+        **{f"to_dict_basket_{size}": _to_dict(size) for size in BASKET_SIZES},
+        "transaction_details_to_dict": _transaction_details_to_dict(),
+    }
+
+
+def measure(setup: Callable, operation: Callable, iterations: int) -> dict:
+    """
+    Run the operation on a fresh offline Pos and measure its cost
+    Return:
+        dict: Median wall time, WebDriver commands and peak allocated bytes per operation
+    """
+    offline = build_offline_pos()
+    durations, commands = [], []
+    for _ in range(iterations):
+        setup(offline)
+        executed = offline.driver.commands_executed
+        started = time.perf_counter()
+        operation(offline)
+        durations.append(time.perf_counter() - started)
+        commands.append(offline.driver.commands_executed - executed)
+    setup(offline)
+    tracemalloc.start()
+    operation(offline)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_time": statistics.median(durations),
+        "webdriver_commands": max(commands),
+        "peak_allocated_bytes": peak,
+    }
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            regressions.append(f"{name}: not in the baseline, record it with --update-baseline")
+            continue
+        if result["webdriver_commands"] > expected["webdriver_commands"]:
+            regressions.append(
+                f"{name}: {result['webdriver_commands']} WebDriver commands, baseline {expected['webdriver_commands']}"
+            )
+        for metric in ("wall_time", "peak_allocated_bytes"):
+            if result[metric] > expected[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]:.6g}, baseline {expected[metric]:.6g}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase of time and memory")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--only", help="Run only the scenarios containing this text")
+    args = parser.parse_args()
+
+    if not args.update_baseline and not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, record one with --update-baseline")
+        return 1
+
+    results, errors = {}, []
+    for name, (setup, operation) in scenarios().items():
+        if args.only and args.only not in name:
+            continue
+        try:
+            results[name] = measure(setup, operation, args.iterations)
+        except Exception as error:
+            errors.append(f"{name}: {error!r}")
+            print(f"{name:<32} ERROR {error!r}")
+            continue
+        print(
+            f"{name:<32} {results[name]['wall_time'] * 1000:9.3f} ms "
+            f"{results[name]['webdriver_commands']:6d} cmds {results[name]['peak_allocated_bytes']:10d} B"
+        )
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 1 if errors else 0
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions or errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
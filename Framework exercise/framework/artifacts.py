@@ -0,0 +1,140 @@
+import base64
+import gzip
+import json
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from hornets.utilities.log_config import logger
+
+
+class RollingArtifactStore:
+    """
+    Directory of failure captures capped in size, the oldest captures are deleted first
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def new_capture(self, name: str) -> Path:
+        safe_name = re.sub(r"[^\w.-]", "_", name)[:150]
+        capture = self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_name}"
+        capture.mkdir(parents=True, exist_ok=True)
+        return capture
+
+    def enforce_limit(self):
+        with self._lock:
+            captures = sorted(
+                (path for path in self.directory.iterdir() if path.is_dir()), key=lambda path: path.stat().st_mtime
+            )
+            sizes = {
+                capture: sum(file.stat().st_size for file in capture.rglob("*") if file.is_file())
+                for capture in captures
+            }
+            total = sum(sizes.values())
+            for capture in captures[:-1]:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(capture, ignore_errors=True)
+                total -= sizes[capture]
+
+
+class FailureArtifactCollector:
+    """
+    Capture failure artifacts with as few driver calls as possible on the test thread, and leave decoding,
+    compression and writing to background workers. Captures are dropped when too many are still pending,
+    which happens when a lane goes bad and tests fail in a row
+    """
+
+    def __init__(
+            self,
+            directory: str | Path,
+            max_bytes: int = 500 * 1024 * 1024,
+            workers: int = 2,
+            max_pending: int = 8
+    ):
+        self.store = RollingArtifactStore(directory, max_bytes)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def capture(
+            self,
+            name: str,
+            driver: WebDriver,
+            journal: Callable[[], dict] = None,
+            logs: Dict[str, Callable[[], str]] = None
+    ) -> bool:
+        """
+        Grab the raw artifacts of a failure and queue them to be written
+        Args:
+            name (str): Name of the capture, usually the test node id
+            driver (WebDriver): Driver to take the screenshot and DOM from
+            journal (Callable): Returns the journal display as a dict, called on the test thread
+            logs (dict): Simulator logs providers by name, called in the background
+        Return:
+            bool: True if the capture was queued, False if it was dropped
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning(f"Failure artifacts for {name} dropped, {self._pending} captures still pending")
+                return False
+            self._pending += 1
+        submitted = False
+        try:
+            raw = {}
+            for artifact, grab in (
+                ("screenshot", driver.get_screenshot_as_base64),
+                ("dom", lambda: driver.page_source),
+                ("journal", journal),
+            ):
+                if grab is None:
+                    continue
+                try:
+                    raw[artifact] = grab()
+                except Exception as error:
+                    # A bad lane fails in many ways: WebDriver errors, connection errors, missing elements
+                    logger.warning(f"Could not capture {artifact} for {name}: {error!r}")
+            self._executor.submit(self._write, name, raw, logs or {})
+            submitted = True
+        except RuntimeError as error:
+            logger.warning(f"Failure artifacts for {name} dropped, collector is closed: {error}")
+        finally:
+            if not submitted:
+                with self._lock:
+                    self._pending -= 1
+        return submitted
+
+    def _write(self, name: str, raw: dict, logs: Dict[str, Callable[[], str]]):
+        try:
+            capture = self.store.new_capture(name)
+            if "screenshot" in raw:
+                (capture / "screenshot.png").write_bytes(base64.b64decode(raw["screenshot"]))
+            if "dom" in raw:
+                (capture / "dom.html.gz").write_bytes(gzip.compress(raw["dom"].encode("utf-8")))
+            if "journal" in raw:
+                (capture / "journal.json").write_text(json.dumps(raw["journal"], indent=2, default=str))
+            for log_name, read_log in logs.items():
+                (capture / f"{log_name}.log.gz").write_bytes(gzip.compress(read_log().encode("utf-8")))
+            self.store.enforce_limit()
+        except Exception as error:
+            logger.warning(f"Failure artifacts for {name} could not be written: {error!r}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def close(self):
+        """
+        Wait for the pending captures to be written
+        """
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Tuple
+
+from hornets.base_enum import BaseEnum
+from hornets.components.exceptions import ElementNotFoundException
+from hornets.utilities.locators import resolve_xpath
+
+BATCH_SCRIPT = """
+const commands = arguments[0];
+const results = [];
+for (const [action, expression] of commands) {
+    if (action === "count") {
+        results.push(document.evaluate(
+            expression, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        ).snapshotLength);
+        continue;
+    }
+    const node = document.evaluate(
+        expression, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    if (action === "exists") {
+        results.push(node !== null);
+    } else if (action === "text") {
+        results.push(node === null ? null : node.innerText.trim());
+    } else if (action === "click") {
+        if (node === null) {
+            return {missing: expression, results: results};
+        }
+        node.click();
+        results.push(true);
+    }
+}
+return {missing: null, results: results};
+"""
+
+
+class BatchResult:
+    """
+    Placeholder for the value of a batched command, available once the batch has been executed
+    """
+
+    def __init__(self, locator: BaseEnum):
+        self.locator = locator
+        self._value = None
+        self._resolved = False
+
+    def _resolve(self, value: Any):
+        self._value = value
+        self._resolved = True
+
+    @property
+    def value(self) -> Any:
+        if not self._resolved:
+            raise RuntimeError(f"Batch containing {self.locator} has not been executed yet")
+        return self._value
+
+
+class CommandBatch:
+    """
+    Queue of locator reads, existence checks and clicks executed together in a single script
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._commands: List[Tuple[str, str]] = []
+        self._results: List[BatchResult] = []
+
+    def _queue(self, action: str, locator: BaseEnum, additional_attribute: str = None) -> BatchResult:
+        result = BatchResult(locator)
+        self._commands.append((action, resolve_xpath(locator, additional_attribute)))
+        self._results.append(result)
+        return result
+
+    def get_text(self, locator: BaseEnum, additional_attribute: str = None) -> BatchResult:
+        return self._queue("text", locator, additional_attribute)
+
+    def element_exists(self, locator: BaseEnum, additional_attribute: str = None) -> BatchResult:
+        return self._queue("exists", locator, additional_attribute)
+
+    def count_elements(self, locator: BaseEnum, additional_attribute: str = None) -> BatchResult:
+        return self._queue("count", locator, additional_attribute)
+
+    def click(self, locator: BaseEnum, additional_attribute: str = None) -> BatchResult:
+        return self._queue("click", locator, additional_attribute)
+
+    def execute(self) -> List[Any]:
+        """
+        Run every queued command in order with a single WebDriver call
+        Return:
+            list: Values of the commands, in the order they were queued
+        """
+        if not self._commands:
+            return []
+        response = self.driver.execute_script(BATCH_SCRIPT, self._commands)
+        for result, value in zip(self._results, response["results"]):
+            result._resolve(value)
+        if response["missing"] is not None:
+            raise ElementNotFoundException(f"Element to click was not found: {response['missing']}")
+        return response["results"]
+
+
+class BatchCommandsMixin:
+    """
+    Adds batch() to Base subclasses. Commands queued inside the with block are sent to the browser together
+    when the block exits. Unlike the Base methods, batched commands do not wait for elements to appear
+    """
+
+    @contextmanager
+    def batch(self) -> Iterator[CommandBatch]:
+        command_batch = CommandBatch(self.driver)
+        yield command_batch
+        command_batch.execute()
@@ -1,3 +1,141 @@
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
+import itertools
+import json
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from hornets.components.pos.lanes import LANES_ENV_VAR, Lane, LaneScheduler, load_lanes
+from hornets.components.pos.pos import Pos
+from hornets.components.pos.pos_pool import PosPool, lane_session_factories
+from hornets.utilities.artifacts import FailureArtifactCollector
+from hornets.utilities.tracing import TraceReport, tracer, write_trace
+
+TRACE_DIR = Path(os.environ.get("HORNETS_TRACE_DIR", "traces"))
+ARTIFACTS_DIR = Path(os.environ.get("HORNETS_ARTIFACTS_DIR", "artifacts"))
+trace_report_key = pytest.StashKey[TraceReport]()
+artifact_collector_key = pytest.StashKey[FailureArtifactCollector]()
+LANE_SPREAD_MARKERS = {"pos", "payment", "ert"}
+
+
+@pytest.fixture(scope="session")
+def lane(tmp_path_factory) -> Lane | None:
+    """
+    Lane owned by this worker process for the whole session, None when no lanes are configured
+    """
+    lanes_file = os.environ.get(LANES_ENV_VAR)
+    if not lanes_file:
+        yield None
+        return
+    scheduler = LaneScheduler(load_lanes(lanes_file), lock_dir=tmp_path_factory.getbasetemp().parent / "lanes")
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    lane = scheduler.acquire(worker_index=int(worker.removeprefix("gw")))
+    yield lane
+    scheduler.release(lane)
+
+
+@pytest.fixture(scope="session")
+def pos_pool(request, lane) -> PosPool:
+    if lane is None:
+        # The session driver belongs to pos_session, the pool cannot replace it
+        pos_session = request.getfixturevalue("pos_session")
+        pool = PosPool(
+            create_driver=lambda: pos_session.driver,
+            create_pos=lambda driver: Pos(driver, pos_session.active_tabs),
+            owns_drivers=False,
+        )
+    else:
+        # Lane sessions are opened by the pool, the default pos_session is not started on lane runs
+        create_driver, create_pos = lane_session_factories(lane)
+        pool = PosPool(create_driver=create_driver, create_pos=create_pos)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def pos(pos_session) -> Pos:  # type: ignore
-    yield Pos()
\ No newline at end of file
+def pos(pos_pool) -> Pos:  # type: ignore
+    with pos_pool.lease() as pos:
+        yield pos
+
+
+@pytest.fixture(scope="function", autouse=True)
+def action_trace(request):
+    yield
+    if tracer.enabled:
+        spans = tracer.collect()
+        request.config.stash[trace_report_key].add(spans)
+        file_name = re.sub(r"[^\w.-]", "_", request.node.nodeid) + ".json"
+        write_trace(TRACE_DIR / file_name, request.node.nodeid, spans)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--startup-budget",
+        type=float,
+        default=None,
+        help="Fail the run when conftest imports and test collection take longer than this many seconds",
+    )
+
+
+def pytest_collection_finish(session):
+    budget = session.config.getoption("--startup-budget")
+    elapsed = time.perf_counter() - STARTUP_STARTED
+    if budget is not None and elapsed > budget:
+        raise pytest.UsageError(
+            f"Startup took {elapsed:.2f}s, over the {budget:.2f}s budget. "
+            f"Profile it with: python -m hornets.utilities.startup_profile hornets.components.pos.pos"
+        )
+
+
+def pytest_configure(config):
+    config.stash[trace_report_key] = TraceReport()
+
+
+def _artifact_collector(config) -> FailureArtifactCollector:
+    """
+    Collector of the failure artifacts, created on the first failure so runs without failures, and the xdist
+    controller, do not start its threads or create the artifacts directory
+    """
+    if artifact_collector_key not in config.stash:
+        config.stash[artifact_collector_key] = FailureArtifactCollector(ARTIFACTS_DIR)
+    return config.stash[artifact_collector_key]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    pos = item.funcargs.get("pos") if hasattr(item, "funcargs") else None
+    if report.failed and report.when == "call" and pos is not None:
+        _artifact_collector(item.config).capture(
+            item.nodeid, pos.driver, journal=lambda: pos.transaction.snapshot().to_dict()
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Interleave tests by their pos/payment/ert markers so load distribution spreads every group over all lanes
+    """
+    if not os.environ.get(LANES_ENV_VAR):
+        return
+    groups = defaultdict(list)
+    for item in items:
+        groups[tuple(sorted({marker.name for marker in item.iter_markers()} & LANE_SPREAD_MARKERS))].append(item)
+    items[:] = [item for batch in itertools.zip_longest(*groups.values()) for item in batch if item is not None]
+
+
+def pytest_sessionfinish(session):
+    artifact_collector = session.config.stash.get(artifact_collector_key, None)
+    if artifact_collector is not None:
+        artifact_collector.close()
+    if tracer.enabled:
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        report = session.config.stash[trace_report_key].to_dict()
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        (TRACE_DIR / f"report-{worker}.json").write_text(json.dumps(report, indent=2))
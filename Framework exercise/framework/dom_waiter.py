@@ -0,0 +1,118 @@
+import time
+from dataclasses import dataclass
+
+from selenium.common import WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from hornets.base_enum import BaseEnum
+from hornets.utilities.constants import POLLING_TIMEOUT
+from hornets.utilities.locators import resolve_xpath
+from hornets.utilities.log_config import logger
+from hornets.utilities.tracing import tracer
+
+DOM_WAIT_SCRIPT = """
+const [expression, expectedText, present, timeoutMs, done] = arguments;
+if (!window.__hornetsObserver) {
+    const listeners = new Set();
+    new MutationObserver(() => listeners.forEach((listener) => listener())).observe(
+        document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true}
+    );
+    window.__hornetsObserver = {listeners};
+}
+const started = performance.now();
+const matches = () => {
+    let text = document.body ? document.body.innerText : "";
+    if (expression !== null) {
+        const node = document.evaluate(
+            expression, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (node === null) {
+            return !present;
+        }
+        text = node.innerText;
+    }
+    const found = expectedText === null || text.includes(expectedText);
+    return present ? found : !found;
+};
+let timer = null;
+const finish = (satisfied) => {
+    window.__hornetsObserver.listeners.delete(check);
+    clearTimeout(timer);
+    done({satisfied: satisfied, latency: (performance.now() - started) / 1000});
+};
+const check = () => {
+    if (matches()) {
+        finish(true);
+    }
+};
+if (matches()) {
+    done({satisfied: true, latency: 0});
+} else {
+    window.__hornetsObserver.listeners.add(check);
+    timer = setTimeout(() => finish(false), timeoutMs);
+}
+"""
+
+
+@dataclass
+class WaitResult:
+    """
+    Outcome of a DOM wait. executed is False when the script could not run, the caller should then fall back
+    to its polling wait. A wait that executed and is not satisfied already waited for the whole timeout
+    """
+    satisfied: bool
+    latency: float
+    executed: bool = True
+
+
+class DomWaiter:
+    """
+    Event driven waits: a MutationObserver injected once in the page wakes the wait up as soon as the DOM changes,
+    so a single async script call replaces the poll loop
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._script_timeout = None
+
+    def _ensure_script_timeout(self, timeout: float):
+        if self._script_timeout is None or self._script_timeout < timeout:
+            self._script_timeout = timeout + 1
+            self.driver.set_script_timeout(self._script_timeout)
+
+    def wait_for(
+            self,
+            locator: BaseEnum = None,
+            text: str = None,
+            present: bool = True,
+            additional_attribute: str = None,
+            timeout: float = POLLING_TIMEOUT
+    ) -> WaitResult:
+        """
+        Block until the locator (or the whole page when no locator is given) shows, or stops showing, the text
+        Args:
+            locator (BaseEnum): Locator to watch, the whole page body if None
+            text (str): Text expected in the element, any content if None
+            present (bool): Wait for the condition to appear if True, to disappear if False
+            additional_attribute (str): Value for the locator placeholder, if any
+            timeout (float): Seconds to wait before giving up
+        Return:
+            WaitResult: Whether the condition was met and the observed latency in seconds
+        """
+        expression = resolve_xpath(locator, additional_attribute) if locator is not None else None
+        started = time.perf_counter()
+        try:
+            self._ensure_script_timeout(timeout)
+            result = self.driver.execute_async_script(
+                DOM_WAIT_SCRIPT, expression, text, present, int(timeout * 1000)
+            )
+        except WebDriverException as error:
+            logger.warning(f"DOM wait could not be executed: {error.msg}")
+            return WaitResult(satisfied=False, latency=time.perf_counter() - started, executed=False)
+        wait_result = WaitResult(satisfied=result["satisfied"], latency=result["latency"])
+        tracer.measure("dom_wait_latency", wait_result.latency)
+        logger.debug(
+            f"DOM wait for {locator or 'page'} {'showing' if present else 'not showing'} {text or 'content'}: "
+            f"{'met' if wait_result.satisfied else 'timed out'} after {wait_result.latency:.3f}s"
+        )
+        return wait_result
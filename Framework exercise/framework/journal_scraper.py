@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from selenium.common import JavascriptException, WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from hornets.base_enum import BaseEnum
+from hornets.utilities.locators import compile_locator, locator_template
+from hornets.utilities.log_config import logger
+
+JOURNAL_SCRAPE_SCRIPT = """
+const [locators, known] = arguments;
+const hash = (value) => {
+    let result = 5381;
+    for (let index = 0; index < value.length; index++) {
+        result = ((result * 33) ^ value.charCodeAt(index)) >>> 0;
+    }
+    return result.toString(16);
+};
+const snapshot = (expression) => document.evaluate(
+    expression, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const text = (expression) => {
+    const node = snapshot(expression).snapshotItem(0);
+    return node ? node.innerText.trim() : null;
+};
+const rows = (rowsExpression, fields, knownHashes) => {
+    const result = [];
+    const count = snapshot(rowsExpression).snapshotLength;
+    const columns = {};
+    for (const [name, cell] of Object.entries(fields)) {
+        const cells = cell.all_rows === null ? null : snapshot(cell.all_rows);
+        if (cells !== null && cells.snapshotLength === count) {
+            columns[name] = (index) => cells.snapshotItem(index - 1).innerText.trim();
+        } else {
+            columns[name] = (index) => text(cell.template.split("{}").join(String(index)));
+        }
+    }
+    for (let index = 1; index <= count; index++) {
+        const row = {};
+        for (const [name, column] of Object.entries(columns)) {
+            row[name] = column(index);
+        }
+        const rowHash = hash(Object.values(row).join("\u0000"));
+        result.push({hash: rowHash, row: knownHashes[index - 1] === rowHash ? null : row});
+    }
+    return result;
+};
+return {
+    items: rows(locators.items, {name: locators.item_description, price: locators.item_price}, known.items),
+    transaction_discounts: rows(
+        locators.transaction_discounts,
+        {description: locators.transaction_discount_description, price: locators.transaction_discount_amount},
+        known.transaction_discounts
+    ),
+    total: text(locators.total_amount),
+    basket_count: text(locators.basket_count),
+};
+"""
+
+
+def _diff_rows(rows: List[dict], previous_rows: List[dict]) -> dict:
+    return {
+        "added": rows[len(previous_rows):],
+        "removed": previous_rows[len(rows):],
+        "changed": [
+            {"index": index, "before": before, "after": after}
+            for index, (before, after) in enumerate(zip(previous_rows, rows), 1)
+            if before != after
+        ],
+    }
+
+
+@dataclass
+class JournalSnapshot:
+    """
+    Journal display as read at one point of the transaction. Row hashes let the next scrape skip sending back
+    the rows that did not change
+    """
+    items: List[dict]
+    transaction_discounts: List[dict]
+    total_amount: dict
+    item_hashes: List[str] = field(default_factory=list)
+    transaction_discount_hashes: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "transaction_discounts": self.transaction_discounts,
+            "total_amount": self.total_amount,
+        }
+
+    def diff(self, previous: "JournalSnapshot") -> dict:
+        """
+        Get what changed in the journal since a previous snapshot
+        Args:
+            previous (JournalSnapshot): Snapshot to compare against
+        Return:
+            dict: Added, removed and changed rows, by 1-based row index, for items and transaction discounts,
+                  and the total before and after if it changed
+        """
+        changes = {
+            "items": _diff_rows(self.items, previous.items),
+            "transaction_discounts": _diff_rows(self.transaction_discounts, previous.transaction_discounts),
+        }
+        if self.total_amount != previous.total_amount:
+            changes["total_amount"] = {"before": previous.total_amount, "after": self.total_amount}
+        return changes
+
+
+def _merge_rows(scraped: List[dict], previous_rows: List[dict]) -> List[dict]:
+    return [
+        entry["row"] if entry["row"] is not None else previous_rows[index]
+        for index, entry in enumerate(scraped)
+    ]
+
+
+def _cell(locator: BaseEnum) -> dict:
+    compiled = compile_locator(locator)
+    return {"template": compiled.template, "all_rows": compiled.all_rows}
+
+
+class JournalScraper:
+    """
+    Read the whole journal display with a single script execution instead of one WebDriver call per cell.
+    Cells are read with one XPath query per column when the locator allows it, instead of one per row
+    """
+
+    def __init__(self, driver: WebDriver, transaction_locators):
+        self.driver = driver
+        self.transaction_locators = transaction_locators
+
+    def _script_locators(self) -> dict:
+        locators = self.transaction_locators
+        return {
+            "items": locator_template(locators.TRANSACTION_DETAILS_DESCRIPTION),
+            "item_description": _cell(locators.ITEM_DESCRIPTION),
+            "item_price": _cell(locators.ITEM_PRICE),
+            "transaction_discounts": locator_template(locators.TRANSACTION_DISCOUNTS),
+            "transaction_discount_description": _cell(locators.TRANSACTION_DISCOUNT_DESCRIPTION),
+            "transaction_discount_amount": _cell(locators.TRANSACTION_DISCOUNT_AMOUNT),
+            "total_amount": locator_template(locators.TOTAL_AMOUNT),
+            "basket_count": locator_template(locators.BASKET_COUNT),
+        }
+
+    def scrape(self, previous: JournalSnapshot = None) -> JournalSnapshot | None:
+        """
+        Get items, transaction discounts, total and basket count from the journal display.
+        Rows unchanged since the previous snapshot are not sent back by the browser and are taken from it
+        Args:
+            previous (JournalSnapshot): Last snapshot of the same transaction, if any
+        Return:
+            JournalSnapshot | None: Journal display values, None if the script could not be executed
+        """
+        known = {
+            "items": previous.item_hashes if previous else [],
+            "transaction_discounts": previous.transaction_discount_hashes if previous else [],
+        }
+        try:
+            journal = self.driver.execute_script(JOURNAL_SCRAPE_SCRIPT, self._script_locators(), known)
+        except (JavascriptException, WebDriverException) as error:
+            logger.warning(f"Bulk journal scrape failed, falling back to element by element reads: {error.msg}")
+            return None
+        if journal["total"] is None or journal["basket_count"] is None:
+            logger.warning("Bulk journal scrape could not find the transaction total, falling back")
+            return None
+        return JournalSnapshot(
+            items=_merge_rows(journal["items"], previous.items if previous else []),
+            transaction_discounts=_merge_rows(
+                journal["transaction_discounts"], previous.transaction_discounts if previous else []
+            ),
+            total_amount={
+                "total": journal["total"].replace("$", ""),
+                "basket_count": int(journal["basket_count"]),
+            },
+            item_hashes=[entry["hash"] for entry in journal["items"]],
+            transaction_discount_hashes=[entry["hash"] for entry in journal["transaction_discounts"]],
+        )
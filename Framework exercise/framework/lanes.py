@@ -0,0 +1,102 @@
+import fcntl
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from hornets.base_enum import BaseEnum
+from hornets.utilities.log_config import logger
+
+LANES_ENV_VAR = "HORNETS_LANES"
+
+
+class SignOnLocators(BaseEnum):
+    SIGN_ON = "//button[normalize-space()='Sign On']"
+
+
+@dataclass(frozen=True)
+class Lane:
+    """
+    A POS register with its own pinpad simulator, scanner and receipt store. pos_url is the POS web app the
+    lane browser sessions open, operator_id and operator_password sign an operator on once it is loaded
+    """
+    name: str
+    webdriver_url: str
+    pos_url: str
+    operator_id: str = None
+    operator_password: str = None
+    pinpad_options: dict = field(default_factory=dict)
+    scanner_options: dict = field(default_factory=dict)
+    receipt_tool_options: dict = field(default_factory=dict)
+
+
+def load_lanes(path: str | Path) -> List[Lane]:
+    """
+    Load the lane descriptors from a JSON file containing a list of lanes
+    Args:
+        path (str | Path): JSON file with the lanes
+    Return:
+        list: Lanes
+    """
+    return [Lane(**lane) for lane in json.loads(Path(path).read_text())]
+
+
+class LaneScheduler:
+    """
+    Hand out lanes exclusively across worker processes. Ownership is an exclusive flock held on the lane lock
+    file for as long as the lane is used. The kernel drops the lock when its owner exits, so a lane left behind
+    by a killed worker is free again without any takeover logic. The owner pid is written in the file for
+    diagnostics only
+    """
+
+    def __init__(self, lanes: List[Lane], lock_dir: str | Path):
+        self.lanes = lanes
+        self.lock_dir = Path(lock_dir)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._descriptors: Dict[str, int] = {}
+
+    def _lock_path(self, lane: Lane) -> Path:
+        return self.lock_dir / f"{lane.name}.lock"
+
+    def _try_lock(self, lane: Lane) -> bool:
+        descriptor = os.open(self._lock_path(lane), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(descriptor)
+            return False
+        os.ftruncate(descriptor, 0)
+        os.write(descriptor, str(os.getpid()).encode())
+        self._descriptors[lane.name] = descriptor
+        return True
+
+    def acquire(self, worker_index: int = 0, timeout: float = 300, polling_step: float = 1) -> Lane:
+        """
+        Lock a free lane, starting from the one matching the worker index
+        Args:
+            worker_index (int): Index of the worker process, used to spread workers over lanes
+            timeout (float): Seconds to wait for a lane to be free
+            polling_step (float): Seconds between attempts
+        Return:
+            Lane: Lane locked for this process
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            for offset in range(len(self.lanes)):
+                lane = self.lanes[(worker_index + offset) % len(self.lanes)]
+                if self._try_lock(lane):
+                    logger.info(f"Lane {lane.name} acquired by process {os.getpid()}")
+                    return lane
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No lane was free after {timeout} seconds")
+            time.sleep(polling_step)
+
+    def release(self, lane: Lane):
+        # The lock file is kept: unlinking it would let a new worker lock a fresh file while another one
+        # still waits on the old descriptor
+        descriptor = self._descriptors.pop(lane.name, None)
+        if descriptor is not None:
+            fcntl.flock(descriptor, fcntl.LOCK_UN)
+            os.close(descriptor)
@@ -0,0 +1,39 @@
+import importlib
+from typing import Any
+
+
+class LazyImport:
+    """
+    Stand-in for a module attribute that imports the module the first time the attribute is called or accessed
+    """
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _resolve(self) -> Any:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, item: str):
+        return getattr(self._resolve(), item)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module}.{self._name}>"
+
+
+def lazy_import(module: str, name: str) -> Any:
+    """
+    Defer importing a heavy component until it is first used
+    Args:
+        module (str): Module path
+        name (str): Attribute of the module
+    Return:
+        Stand-in that behaves like the attribute once used
+    """
+    return LazyImport(module, name)
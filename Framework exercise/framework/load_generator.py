@@ -0,0 +1,241 @@
+"""
+Sustained load generation: drive a weighted mix of POS transactions at a target rate across one or more lanes
+for a fixed duration, streaming every outcome to JSONL.
+
+    python -m hornets.tools.load_generator --tpm 30 --duration 3600 --output load.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from hornets.components.pos.enums import ItemSelectionMethod, PayMode
+from hornets.components.pos.lanes import LANES_ENV_VAR, load_lanes
+from hornets.components.pos.payment.payment import Payment
+from hornets.components.pos.payment.payment_method import CreditCardPaymentMethod, DebitCardPaymentMethod
+from hornets.components.pos.pos import Pos
+from hornets.components.pos.pos_pool import lane_session_factories
+from hornets.components.transaction.enums import WatermarkDisplay
+from hornets.components.transaction.transaction_export import TransactionRecordWriter
+from hornets.utilities.log_config import logger
+from hornets.utilities.stats import summarize
+
+
+@dataclass
+class TransactionProfile:
+    """
+    Kind of transaction in the load mix
+    """
+    name: str
+    weight: float
+    payment: Callable[[], Payment | None]
+    items: List[dict] = field(default_factory=lambda: [{"item": "Item 1"}])
+    pay_mode: PayMode = None
+
+
+def default_mix(zero_amount_items: List[dict] = None) -> List[TransactionProfile]:
+    """
+    Build the default transaction mix
+    Args:
+        zero_amount_items (list): select_item arguments of items whose total is 0.00. The zero amount profile
+                                  is left out of the mix when not given, no such item exists on every POS
+    Return:
+        list: Transaction profiles
+    """
+    mix = [
+        TransactionProfile("credit", 40, lambda: Payment(CreditCardPaymentMethod())),
+        TransactionProfile("debit", 25, lambda: Payment(DebitCardPaymentMethod())),
+        TransactionProfile("cash_back", 15, lambda: Payment(DebitCardPaymentMethod(cashback_amount="10.00"))),
+        TransactionProfile(
+            "partial_approval",
+            10,
+            lambda: Payment(CreditCardPaymentMethod(credit_card_limit="0.01"), CreditCardPaymentMethod()),
+        ),
+    ]
+    if zero_amount_items:
+        mix.append(
+            TransactionProfile(
+                "zero_amount", 10, lambda: None, items=zero_amount_items, pay_mode=PayMode.ZERO_AMOUNT_TRANSACTION
+            )
+        )
+    return mix
+
+
+class LoadGenerator:
+    """
+    Run transactions on every lane in parallel, each lane paced so that together they reach the target rate
+    """
+
+    def __init__(
+            self,
+            lanes: List[Pos],
+            output: Path,
+            target_tpm: float,
+            duration: float,
+            mix: List[TransactionProfile] = None,
+            seed: int = None
+    ):
+        self.lanes = lanes
+        self.output = output
+        self.target_tpm = target_tpm
+        self.duration = duration
+        self.mix = mix or default_mix()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._results_lock = threading.Lock()
+        self._transactions = Counter()
+        self._errors = Counter()
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+
+    def _pick_profile(self) -> TransactionProfile:
+        with self._random_lock:
+            return self._random.choices(self.mix, weights=[profile.weight for profile in self.mix])[0]
+
+    def _run_transaction(self, lane: int, pos: Pos, profile: TransactionProfile) -> dict:
+        started = time.time()
+        timer = time.perf_counter()
+        error = None
+        try:
+            # Pay mode, receipt baseline, transaction details and journal snapshot must not carry over
+            # from the previous transaction of the lane
+            pos.reset()
+            for item in profile.items:
+                pos.select_item(**item)
+            transaction = pos.pay(profile.payment(), pay_mode=profile.pay_mode)
+            if transaction["watermark"] != WatermarkDisplay.TRANSACTION_COMPLETED:
+                error = f"Transaction ended with watermark {transaction['watermark']}"
+        except Exception as exception:
+            error = repr(exception)
+        duration = time.perf_counter() - timer
+        if error:
+            logger.warning(f"Lane {lane} - {profile.name} transaction failed: {error}")
+        return {
+            "lane": lane,
+            "profile": profile.name,
+            "started": started,
+            "duration": duration,
+            "succeeded": error is None,
+            "error": error,
+        }
+
+    def _record(self, outcome: dict, writer: TransactionRecordWriter):
+        writer.write(outcome)
+        with self._results_lock:
+            self._transactions[outcome["profile"]] += 1
+            if outcome["succeeded"]:
+                self._durations[outcome["profile"]].append(outcome["duration"])
+            else:
+                self._errors[outcome["profile"]] += 1
+
+    def _drive_lane(self, lane: int, pos: Pos, deadline: float, writer: TransactionRecordWriter):
+        interval = 60 * len(self.lanes) / self.target_tpm
+        next_start = time.monotonic() + interval * lane / len(self.lanes)
+        while next_start < deadline:
+            time.sleep(max(0.0, next_start - time.monotonic()))
+            self._record(self._run_transaction(lane, pos, self._pick_profile()), writer)
+            next_start = max(next_start + interval, time.monotonic())
+
+    def run(self) -> dict:
+        """
+        Generate load until the duration is over
+        Return:
+            dict: Achieved throughput, error rate and latency percentiles, overall and per profile
+        """
+        started = time.monotonic()
+        deadline = started + self.duration
+        with TransactionRecordWriter(self.output) as writer:
+            threads = [
+                threading.Thread(target=self._drive_lane, args=(lane, pos, deadline, writer), name=f"lane-{lane}")
+                for lane, pos in enumerate(self.lanes)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed: float) -> dict:
+        def summary(transactions: int, errors: int, durations: List[float]) -> dict:
+            return {
+                "transactions": transactions,
+                "error_rate": errors / transactions if transactions else 0.0,
+                "latency": summarize(durations),
+            }
+
+        transactions = sum(self._transactions.values())
+        return {
+            "target_tpm": self.target_tpm,
+            "achieved_tpm": transactions / elapsed * 60 if elapsed else 0.0,
+            **summary(
+                transactions,
+                sum(self._errors.values()),
+                [duration for durations in self._durations.values() for duration in durations],
+            ),
+            "profiles": {
+                profile.name: summary(
+                    self._transactions[profile.name], self._errors[profile.name], self._durations[profile.name]
+                )
+                for profile in self.mix
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tpm", type=float, required=True, help="Target transactions per minute across all lanes")
+    parser.add_argument("--duration", type=float, required=True, help="Seconds to generate load for")
+    parser.add_argument("--output", type=Path, default=Path("load.jsonl"))
+    parser.add_argument("--lanes", default=os.environ.get(LANES_ENV_VAR), help="JSON file with the lanes to use")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--zero-amount-item",
+        help="Speed key item priced 0.00, adds zero amount transactions to the mix when given",
+    )
+    parser.add_argument(
+        "--zero-amount-dept-key",
+        help="Department key sold at 0.00, adds zero amount transactions to the mix when given",
+    )
+    args = parser.parse_args()
+    if not args.lanes:
+        parser.error(f"Lanes must be given with --lanes or {LANES_ENV_VAR}")
+
+    zero_amount_items = []
+    if args.zero_amount_item:
+        zero_amount_items.append({"item": args.zero_amount_item})
+    if args.zero_amount_dept_key:
+        zero_amount_items.append(
+            {"item": args.zero_amount_dept_key, "selection_method": ItemSelectionMethod.DEPT_KEY, "price": "0.00"}
+        )
+
+    pos_instances = []
+    try:
+        for lane in load_lanes(args.lanes):
+            create_driver, create_pos = lane_session_factories(lane)
+            driver = create_driver()
+            try:
+                pos_instances.append(create_pos(driver))
+            except Exception:
+                driver.quit()
+                raise
+        generator = LoadGenerator(
+            lanes=pos_instances,
+            output=args.output,
+            target_tpm=args.tpm,
+            duration=args.duration,
+            mix=default_mix(zero_amount_items),
+            seed=args.seed,
+        )
+        print(json.dumps(generator.run(), indent=2))
+    finally:
+        for pos in pos_instances:
+            pos.driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import functools
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, TypeVar
+
+from selenium.common import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from hornets.base_enum import BaseEnum
+from hornets.components.exceptions import ElementNotFoundException
+from hornets.utilities.constants import POLLING_STEP, POLLING_TIMEOUT
+
+PLACEHOLDER = "{}"
+POSITIONAL_PREDICATE = re.compile(r"\[\s*\{\}\s*\]")
+
+T = TypeVar("T")
+
+
+def locator_template(locator: BaseEnum) -> str:
+    """
+    Get the raw XPath template of a locator, keeping the additional_attribute placeholder
+    Args:
+        locator (BaseEnum): Locator enum member
+    Return:
+        str: XPath template
+    """
+    value = locator.value
+    if isinstance(value, tuple):
+        value = value[-1]
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledLocator:
+    """
+    Locator template split around its additional_attribute placeholder, ready to be filled without reformatting
+    """
+    template: str
+    parts: Tuple[str, ...]
+    all_rows: str | None
+
+    def resolve(self, additional_attribute: str = None) -> str:
+        if additional_attribute is None or len(self.parts) == 1:
+            return self.template
+        return additional_attribute.join(self.parts)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_locator(locator: BaseEnum) -> CompiledLocator:
+    """
+    Compile a locator once. When its only placeholder is a positional predicate, like row[{}]/cell, the
+    compiled locator also carries the XPath returning that cell for every row in a single query
+    Args:
+        locator (BaseEnum): Locator enum member
+    Return:
+        CompiledLocator: Compiled locator
+    """
+    template = locator_template(locator)
+    all_rows = None
+    if template.count(PLACEHOLDER) == 1 and POSITIONAL_PREDICATE.search(template):
+        all_rows = POSITIONAL_PREDICATE.sub("", template)
+    return CompiledLocator(template=template, parts=tuple(template.split(PLACEHOLDER)), all_rows=all_rows)
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve_xpath(locator: BaseEnum, additional_attribute: str = None) -> str:
+    """
+    Get the XPath of a locator with its additional_attribute placeholder filled
+    Args:
+        locator (BaseEnum): Locator enum member
+        additional_attribute (str): Value for the locator placeholder, if any
+    Return:
+        str: XPath expression
+    """
+    return compile_locator(locator).resolve(additional_attribute)
+
+
+class ElementCache:
+    """
+    Memoized WebElement handles for elements that stay on screen, such as function keys.
+    A handle that went stale is looked up again once
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._elements: Dict[Tuple[BaseEnum, str | None], WebElement] = {}
+
+    def find(self, locator: BaseEnum, additional_attribute: str = None) -> WebElement:
+        key = (locator, additional_attribute)
+        if key not in self._elements:
+            self._elements[key] = self.driver.find_element(By.XPATH, resolve_xpath(locator, additional_attribute))
+        return self._elements[key]
+
+    def call(self, locator: BaseEnum, action: Callable[[WebElement], T], additional_attribute: str = None) -> T:
+        """
+        Run an action on the cached element, looking the element up again if its handle went stale
+        Args:
+            locator (BaseEnum): Locator of the element
+            action (Callable): Action to run on the element, like WebElement.click
+            additional_attribute (str): Value for the locator placeholder, if any
+        Return:
+            Result of the action
+        """
+        try:
+            return action(self.find(locator, additional_attribute))
+        except StaleElementReferenceException:
+            self.invalidate(locator, additional_attribute)
+            return action(self.find(locator, additional_attribute))
+
+    def click(self, locator: BaseEnum, additional_attribute: str = None, timeout: float = POLLING_TIMEOUT):
+        """
+        Click the cached element once it is displayed and enabled. Only the lookup is memoized: like Base.click,
+        the click waits for the element and is retried while it is intercepted or not interactable yet
+        Args:
+            locator (BaseEnum): Locator of the element
+            additional_attribute (str): Value for the locator placeholder, if any
+            timeout (float): Seconds to wait for the element to be clickable
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                element = self.find(locator, additional_attribute)
+                if element.is_displayed() and element.is_enabled():
+                    element.click()
+                    return
+            except StaleElementReferenceException:
+                self.invalidate(locator, additional_attribute)
+            except (NoSuchElementException, ElementClickInterceptedException, ElementNotInteractableException):
+                pass
+            if time.monotonic() > deadline:
+                raise ElementNotFoundException(f"Element {locator} was not clickable after {timeout} seconds")
+            time.sleep(POLLING_STEP)
+
+    def invalidate(self, locator: BaseEnum = None, additional_attribute: str = None):
+        """
+        Forget a cached element, or every cached element if no locator is given
+        """
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop((locator, additional_attribute), None)
@@ -0,0 +1,652 @@
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, List, Tuple
+
+from selenium.common import NoSuchElementException, TimeoutException
+
+from hornets.base_enum import BaseEnum
+from hornets.components.pos.pos import Pos
+from hornets.components.pos.pos_locators import (
+    FunctionKeysLocators,
+    JournalDisplayLocators,
+    PosMainLocators,
+    PosPromptBoxLocators,
+)
+from hornets.components.transaction.enums import WatermarkDisplay
+from hornets.components.transaction.journal_scraper import JOURNAL_SCRAPE_SCRIPT
+from hornets.components.transaction.transaction import WATERMARK_LOCATOR
+from hornets.utilities.batch import BATCH_SCRIPT
+from hornets.utilities.constants import POLLING_TIMEOUT
+from hornets.utilities.dom_waiter import DOM_WAIT_SCRIPT
+from hornets.utilities.locators import locator_template
+
+PINPAD_PROCESSING_TEXT = "Processing"
+
+
+class OfflineItemKeyLocators(BaseEnum):
+    """
+    Speed key and department key buttons of the simulated POS, the placeholder is the page, group or item name
+    """
+    SPEED_KEY_PAGE = "//div[@id='speed-keys']//button[@data-page='{}']"
+    SPEED_KEY_GROUP = "//div[@id='speed-keys']//button[@data-group='{}']"
+    SPEED_KEY = "//div[@id='speed-keys']//button[normalize-space(text())='{}']"
+    DEPT_KEY = "//div[@id='department-keys']//button[normalize-space(text())='{}']"
+
+
+@dataclass
+class SimulatorLatencies:
+    """
+    Seconds the simulated POS and pinpad take for each step, all zero by default
+    """
+    pinpad_ready: float = 0.0
+    authorization: float = 0.0
+    transaction_completion: float = 0.0
+
+
+class PinpadState(Enum):
+    IDLE = "idle"
+    WAITING_FOR_CARD = "waiting for card"
+    PROCESSING = "processing"
+    APPROVED = "approved"
+
+
+@dataclass
+class SimulatedItem:
+    name: str
+    price: float
+
+
+class PosSimulator:
+    """
+    In memory state machine of the POS journal, watermark, prompts and pinpad.
+    Transitions with a latency are scheduled and applied when their time has come
+    """
+
+    def __init__(self, latencies: SimulatorLatencies = None):
+        self.latencies = latencies or SimulatorLatencies()
+        self.items: List[SimulatedItem] = []
+        self.transaction_discounts: List[SimulatedItem] = []
+        self.watermark = None
+        self.prompt = None
+        self.pinpad_state = PinpadState.IDLE
+        self.paid_amount = 0.0
+        self.receipts: List[dict] = []
+        self.card_reads: List[Tuple[str, float]] = []
+        self.catalog: Dict[str, float] = {}
+        self.speed_key_page = 1
+        self.speed_key_group = None
+        self._pending: List[Tuple[float, int, Callable]] = []
+        self._sequence = itertools.count()
+
+    # Scheduling
+
+    def schedule(self, delay: float, action: Callable):
+        if delay <= 0:
+            action()
+            return
+        self._pending.append((time.monotonic() + delay, next(self._sequence), action))
+        self._pending.sort()
+
+    def advance(self):
+        """
+        Apply the transitions whose time has come
+        """
+        now = time.monotonic()
+        while self._pending and self._pending[0][0] <= now:
+            _, _, action = self._pending.pop(0)
+            action()
+
+    def wait_until(self, condition: Callable[[], bool], timeout: float = POLLING_TIMEOUT) -> float:
+        """
+        Wait, sleeping only until the next scheduled transition, for the condition to be met
+        Args:
+            condition (Callable): Condition on the simulator state
+            timeout (float): Seconds to wait
+        Return:
+            float: Seconds waited
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            self.advance()
+            if condition():
+                return time.monotonic() - started
+            if not self._pending or self._pending[0][0] > deadline:
+                raise TimeoutException(f"Simulated POS did not reach the expected state in {timeout} seconds")
+            time.sleep(max(0.0, self._pending[0][0] - time.monotonic()))
+
+    # Journal
+
+    @property
+    def total(self) -> float:
+        return round(
+            sum(item.price for item in self.items) - sum(item.price for item in self.transaction_discounts), 2
+        )
+
+    @property
+    def balance(self) -> float:
+        return round(self.total - self.paid_amount, 2)
+
+    def new_transaction(self):
+        """
+        Clear the journal, watermark, prompt and pinpad for the next transaction, keeping the receipts
+        """
+        self.items = []
+        self.transaction_discounts = []
+        self.watermark = None
+        self.prompt = None
+        self.pinpad_state = PinpadState.IDLE
+        self.paid_amount = 0.0
+        self._pending = []
+
+    def add_item(self, name: str = "Item 1", price: float = 1.0):
+        self.items.append(SimulatedItem(name, price))
+
+    def press_speed_key(self, name: str):
+        """
+        Add the item behind a speed key, priced from the catalog and 1.00 if it is not listed
+        """
+        self.add_item(name, self.catalog.get(name, 1.0))
+        self._complete_if_nothing_to_tender()
+
+    def press_department_key(self, name: str):
+        """
+        Open a department item, its price is the one entered next on the number keypad
+        """
+        self.add_item(name, 0.0)
+
+    def enter_price(self, price: float):
+        self.items[-1].price = price
+        self._complete_if_nothing_to_tender()
+
+    def _complete_if_nothing_to_tender(self):
+        # A transaction whose total is 0.00 is closed by the POS without going through PAY
+        if self.items and self.total <= 0 and self.paid_amount == 0:
+            self.schedule(self.latencies.transaction_completion, self._complete)
+
+    def add_transaction_discount(self, description: str, amount: float):
+        self.transaction_discounts.append(SimulatedItem(description, amount))
+
+    def journal(self) -> dict:
+        return {
+            "items": [{"name": item.name, "price": f"${item.price:.2f}"} for item in self.items],
+            "transaction_discounts": [
+                {"description": item.name, "price": f"-${item.price:.2f}"} for item in self.transaction_discounts
+            ],
+            "total": f"${self.total:.2f}",
+            "basket_count": str(len(self.items)),
+        }
+
+    def page_text(self) -> str:
+        texts = [self.watermark, self.prompt, PINPAD_PROCESSING_TEXT if self.is_processing() else None]
+        return "\n".join(text for text in texts if text)
+
+    # Payment flow
+
+    def is_processing(self) -> bool:
+        return self.pinpad_state == PinpadState.PROCESSING
+
+    def select_tender(self):
+        self.watermark = None
+        if self.balance <= 0:
+            self.schedule(self.latencies.transaction_completion, self._complete)
+
+    def select_card(self):
+        self.schedule(self.latencies.pinpad_ready, self._wait_for_card)
+
+    def present_card(self, approved_limit: float = None, cashback_amount: str = None, card_name: str = "card"):
+        """
+        Read a card on the pinpad and authorize it for the balance, or the approved limit if lower
+        Args:
+            approved_limit (float): Maximum amount the host approves, the whole balance if None
+            cashback_amount (str): Cash back requested with the card
+            card_name (str): Card name, recorded with the read time in card_reads
+        """
+        self.card_reads.append((card_name, time.monotonic()))
+        self.pinpad_state = PinpadState.PROCESSING
+        amount = self.balance + float(cashback_amount or 0)
+        if approved_limit is not None and approved_limit < amount:
+            self.schedule(self.latencies.authorization, lambda: self._authorize_partially(approved_limit))
+        else:
+            self.schedule(self.latencies.authorization, lambda: self._approve(amount))
+
+    def pay_cash(self, amount: float = None):
+        self._approve(self.balance if amount is None else amount)
+
+    def answer_prompt(self):
+        self.prompt = None
+        self.pinpad_state = PinpadState.IDLE
+
+    def _wait_for_card(self):
+        self.pinpad_state = PinpadState.WAITING_FOR_CARD
+
+    def _authorize_partially(self, approved_limit: float):
+        self.paid_amount += approved_limit
+        self.pinpad_state = PinpadState.APPROVED
+        self.prompt = f"Partial approval for ${approved_limit:.2f}"
+
+    def _approve(self, amount: float):
+        self.paid_amount += amount
+        self.pinpad_state = PinpadState.APPROVED
+        if self.balance <= 0:
+            self.schedule(self.latencies.transaction_completion, self._complete)
+
+    def _complete(self):
+        self.pinpad_state = PinpadState.IDLE
+        self.watermark = WatermarkDisplay.TRANSACTION_COMPLETED.value
+        self.receipts.append({"number": len(self.receipts) + 1, **self.journal()})
+
+    def last_receipt(self) -> dict | None:
+        return self.receipts[-1] if self.receipts else None
+
+
+ElementTexts = Callable[[PosSimulator, str | None], List[str]]
+
+
+class FakeElement:
+    def __init__(
+            self,
+            driver: "FakeWebDriver",
+            texts: ElementTexts,
+            attribute: str | None,
+            index: int,
+            on_click: Callable[[PosSimulator, str | None], None] = None
+    ):
+        self._driver = driver
+        self._texts = texts
+        self._attribute = attribute
+        self._index = index
+        self._on_click = on_click
+
+    @property
+    def text(self) -> str:
+        return self._driver.execute("getElementText", {"element": self})["value"]
+
+    def click(self):
+        self._driver.execute("clickElement", {"element": self})
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def _click(self, simulator: PosSimulator):
+        if self._on_click:
+            self._on_click(simulator, self._attribute)
+
+    def _read_text(self, simulator: PosSimulator) -> str:
+        texts = self._texts(simulator, self._attribute)
+        return texts[self._index] if self._index < len(texts) else ""
+
+
+class FakeWebDriver:
+    """
+    In memory WebDriver answering the locators and scripts used by the framework from a PosSimulator.
+    Every call goes through execute, like the Selenium remote driver, so WebDriver commands can be counted
+    """
+
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+        self.commands_executed = 0
+        self._locators: List[Tuple[re.Pattern, ElementTexts, Callable | None]] = []
+        register_default_locators(self)
+
+    def register(
+            self,
+            locator: BaseEnum,
+            texts: ElementTexts,
+            on_click: Callable[[PosSimulator, str | None], None] = None
+    ):
+        """
+        Answer a locator with the texts of the matching elements
+        Args:
+            locator (BaseEnum): Locator, with or without additional_attribute placeholder
+            texts (Callable): Gets the simulator and the additional_attribute, returns one text per element
+            on_click (Callable): Gets the simulator and the additional_attribute when the element is clicked
+        """
+        pattern = re.escape(locator_template(locator)).replace(re.escape("{}"), "(.+?)")
+        self._locators.insert(0, (re.compile(f"^{pattern}$"), texts, on_click))
+
+    def _resolve(self, expression: str) -> List[FakeElement]:
+        for pattern, texts, on_click in self._locators:
+            match = pattern.match(expression)
+            if match:
+                attribute = match.group(1) if match.groups() else None
+                count = len(texts(self.simulator, attribute))
+                return [FakeElement(self, texts, attribute, index, on_click) for index in range(count)]
+        return []
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        self.commands_executed += 1
+        self.simulator.advance()
+        params = params or {}
+        match driver_command:
+            case "findElements":
+                return {"value": self._resolve(params["value"])}
+            case "findElement":
+                elements = self._resolve(params["value"])
+                if not elements:
+                    raise NoSuchElementException(f"No simulated element for {params['value']}")
+                return {"value": elements[0]}
+            case "getElementText":
+                return {"value": params["element"]._read_text(self.simulator)}
+            case "clickElement":
+                params["element"]._click(self.simulator)
+                return {"value": None}
+            case "executeScript":
+                return {"value": self._execute_script(params["script"], params["args"])}
+            case "executeAsyncScript":
+                return {"value": self._execute_async_script(params["script"], params["args"])}
+            case "getPageSource":
+                return {"value": f"<html><body>{self.simulator.page_text()}</body></html>"}
+            case _:
+                return {"value": None}
+
+    def _execute_script(self, script: str, args: list):
+        if script == JOURNAL_SCRAPE_SCRIPT:
+            return self._scrape_journal(args[1])
+        if script == BATCH_SCRIPT:
+            return self._execute_batch(args[0])
+        return None
+
+    def _scrape_journal(self, known: dict) -> dict:
+        journal = self.simulator.journal()
+
+        def rows(name: str) -> List[dict]:
+            entries = []
+            for index, row in enumerate(journal[name]):
+                row_hash = format(hash(tuple(row.values())) & 0xFFFFFFFF, "x")
+                unchanged = index < len(known[name]) and known[name][index] == row_hash
+                entries.append({"hash": row_hash, "row": None if unchanged else row})
+            return entries
+        return {**journal, "items": rows("items"), "transaction_discounts": rows("transaction_discounts")}
+
+    def _execute_batch(self, commands: list) -> dict:
+        results = []
+        for action, expression in commands:
+            elements = self._resolve(expression)
+            if action == "count":
+                results.append(len(elements))
+            elif action == "exists":
+                results.append(bool(elements))
+            elif action == "text":
+                results.append(elements[0]._read_text(self.simulator).strip() if elements else None)
+            elif action == "click":
+                if not elements:
+                    return {"missing": expression, "results": results}
+                elements[0]._click(self.simulator)
+                results.append(True)
+        return {"missing": None, "results": results}
+
+    def _execute_async_script(self, script: str, args: list):
+        if script != DOM_WAIT_SCRIPT:
+            return None
+        expression, expected_text, present, timeout_ms = args
+
+        def matches() -> bool:
+            if expression is None:
+                text = self.simulator.page_text()
+            else:
+                elements = self._resolve(expression)
+                if not elements:
+                    return not present
+                text = elements[0]._read_text(self.simulator)
+            found = expected_text is None or expected_text in text
+            return found if present else not found
+
+        try:
+            latency = self.simulator.wait_until(matches, timeout=timeout_ms / 1000)
+        except TimeoutException:
+            return {"satisfied": False, "latency": timeout_ms / 1000}
+        return {"satisfied": True, "latency": latency}
+
+    # WebDriver API used by the framework
+
+    def find_element(self, by: str = "xpath", value: str = None) -> FakeElement:
+        return self.execute("findElement", {"using": by, "value": value})["value"]
+
+    def find_elements(self, by: str = "xpath", value: str = None) -> List[FakeElement]:
+        return self.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script: str, *args):
+        return self.execute("executeScript", {"script": script, "args": list(args)})["value"]
+
+    def execute_async_script(self, script: str, *args):
+        return self.execute("executeAsyncScript", {"script": script, "args": list(args)})["value"]
+
+    def set_script_timeout(self, time_to_wait: float):
+        self.execute("setTimeouts", {"script": int(time_to_wait * 1000)})
+
+    @property
+    def page_source(self) -> str:
+        return self.execute("getPageSource")["value"]
+
+    def get_screenshot_as_base64(self) -> str:
+        return self.execute("screenshot")["value"] or ""
+
+    def refresh(self):
+        self.execute("refresh")
+
+    def quit(self):
+        self.execute("quit")
+
+
+def _rows(values: Callable[[PosSimulator], List[str]]) -> ElementTexts:
+    return lambda simulator, attribute: values(simulator)
+
+
+def _row_cell(values: Callable[[PosSimulator], List[str]]) -> ElementTexts:
+    def texts(simulator: PosSimulator, attribute: str) -> List[str]:
+        rows = values(simulator)
+        index = int(attribute) - 1
+        return [rows[index]] if 0 <= index < len(rows) else []
+    return texts
+
+
+def _single(value: Callable[[PosSimulator], str | None]) -> ElementTexts:
+    return lambda simulator, attribute: [text for text in [value(simulator)] if text is not None]
+
+
+def _named(simulator: PosSimulator, attribute: str) -> List[str]:
+    return [attribute]
+
+
+def _action(action: Callable[[PosSimulator], None]) -> Callable[[PosSimulator, str | None], None]:
+    return lambda simulator, attribute: action(simulator)
+
+
+def register_default_locators(driver: FakeWebDriver):
+    """
+    Answer the journal, function key, prompt, pinpad and item key locators used by Pos and PosTransaction
+    """
+    item_names = lambda simulator: [row["name"] for row in simulator.journal()["items"]]
+    item_prices = lambda simulator: [row["price"] for row in simulator.journal()["items"]]
+    discount_descriptions = lambda simulator: [
+        row["description"] for row in simulator.journal()["transaction_discounts"]
+    ]
+    discount_amounts = lambda simulator: [row["price"] for row in simulator.journal()["transaction_discounts"]]
+    driver.register(JournalDisplayLocators.TRANSACTION_DETAILS_DESCRIPTION, _rows(item_names))
+    driver.register(JournalDisplayLocators.ITEM_DESCRIPTION, _row_cell(item_names))
+    driver.register(JournalDisplayLocators.ITEM_PRICE, _row_cell(item_prices))
+    driver.register(JournalDisplayLocators.TRANSACTION_DISCOUNTS, _rows(discount_descriptions))
+    driver.register(JournalDisplayLocators.TRANSACTION_DISCOUNT_DESCRIPTION, _row_cell(discount_descriptions))
+    driver.register(JournalDisplayLocators.TRANSACTION_DISCOUNT_AMOUNT, _row_cell(discount_amounts))
+    driver.register(JournalDisplayLocators.TOTAL_AMOUNT, _single(lambda simulator: simulator.journal()["total"]))
+    driver.register(
+        JournalDisplayLocators.BASKET_COUNT, _single(lambda simulator: simulator.journal()["basket_count"])
+    )
+    driver.register(
+        PosMainLocators.PINPAD_PROCESSING_TEXT,
+        _single(lambda simulator: PINPAD_PROCESSING_TEXT if simulator.is_processing() else None),
+    )
+    if WATERMARK_LOCATOR is not None:
+        driver.register(WATERMARK_LOCATOR, _single(lambda simulator: simulator.watermark))
+    driver.register(
+        FunctionKeysLocators.PAY, _single(lambda simulator: "Pay"), on_click=_action(PosSimulator.select_tender)
+    )
+    driver.register(
+        FunctionKeysLocators.CARD, _single(lambda simulator: "Card"), on_click=_action(PosSimulator.select_card)
+    )
+    driver.register(
+        PosPromptBoxLocators.YES,
+        _single(lambda simulator: "Yes" if simulator.prompt else None),
+        on_click=_action(PosSimulator.answer_prompt),
+    )
+    driver.register(
+        OfflineItemKeyLocators.SPEED_KEY_PAGE,
+        _named,
+        on_click=lambda simulator, page: setattr(simulator, "speed_key_page", int(page)),
+    )
+    driver.register(
+        OfflineItemKeyLocators.SPEED_KEY_GROUP,
+        _named,
+        on_click=lambda simulator, group: setattr(simulator, "speed_key_group", group),
+    )
+    driver.register(OfflineItemKeyLocators.SPEED_KEY, _named, on_click=PosSimulator.press_speed_key)
+    driver.register(OfflineItemKeyLocators.DEPT_KEY, _named, on_click=PosSimulator.press_department_key)
+
+
+class OfflinePinpad:
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+
+    def wait_for_pinpad_to_be_ready(self):
+        self.simulator.wait_until(lambda: self.simulator.pinpad_state != PinpadState.PROCESSING)
+
+    def wait_for_pinpad_card_action(self):
+        self.simulator.wait_until(lambda: self.simulator.pinpad_state == PinpadState.WAITING_FOR_CARD)
+
+    def wait_for_pinpad_transaction_completion(self):
+        self.simulator.wait_until(lambda: self.simulator.pinpad_state in (PinpadState.APPROVED, PinpadState.IDLE))
+
+
+class OfflinePromptBox:
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+
+    def wait_for_pos_prompt(self, prompt: BaseEnum, additional_attribute: str = None):
+        self.simulator.wait_until(
+            lambda: self.simulator.prompt is not None
+            and (additional_attribute is None or additional_attribute in self.simulator.prompt)
+        )
+
+
+class OfflineWatermark:
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+
+    @property
+    def status(self) -> WatermarkDisplay | None:
+        self.simulator.advance()
+        return WatermarkDisplay(self.simulator.watermark) if self.simulator.watermark is not None else None
+
+    def wait_for_transaction_to_be_in_status(self, status: WatermarkDisplay) -> bool:
+        self.simulator.wait_until(lambda: self.simulator.watermark == status.value)
+        return True
+
+
+class OfflineReceiptTool:
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+
+    def get_last_indoor_receipt_number(self) -> int:
+        return len(self.simulator.receipts)
+
+
+class OfflineScanner:
+    pass
+
+
+class OfflineNumberKeypad:
+    def __init__(self, simulator: PosSimulator):
+        self.simulator = simulator
+
+    def enter_price(self, price: str):
+        self.simulator.enter_price(float(price))
+
+    def enter_value(self, value: str):
+        pass
+
+
+class OfflineItemKeys:
+    """
+    Speed key and department key selection of the simulated POS, clicking the OfflineItemKeyLocators buttons
+    """
+
+    def __init__(self, pos: Pos):
+        self.pos = pos
+
+    def select_item_page(self, page: int):
+        self.pos.element_cache.click(OfflineItemKeyLocators.SPEED_KEY_PAGE, str(page))
+
+    def select_group(self, group: str = None):
+        if group is not None:
+            self.pos.element_cache.click(OfflineItemKeyLocators.SPEED_KEY_GROUP, group)
+
+    def select_item_by_speedkey(self, item: str):
+        self.pos.element_cache.click(OfflineItemKeyLocators.SPEED_KEY, item)
+
+    def select_item_by_deptkey(self, item: str):
+        self.pos.element_cache.click(OfflineItemKeyLocators.DEPT_KEY, item)
+
+
+@dataclass
+class OfflineCard:
+    """
+    Card presented on the simulated pinpad. The host approves up to approved_limit, the whole balance if None.
+    Loading its card data takes preparation_time seconds, ahead of time when prepared by a pipelined Payment
+    """
+    name: str = "VISA"
+    approved_limit: float = None
+    preparation_time: float = 0.0
+    preparation_started: float = field(default=None, init=False)
+    prepared: bool = field(default=False, init=False)
+
+    def prepare(self):
+        self.preparation_started = time.monotonic()
+        time.sleep(self.preparation_time)
+        self.prepared = True
+
+    def process_payment(self, pos: Pos, cashback_amount: str = None):
+        if not self.prepared:
+            self.prepare()
+        pos.pinpad.simulator.present_card(self.approved_limit, cashback_amount, card_name=self.name)
+
+    def process_manual_payment(self, pos: Pos):
+        self.process_payment(pos)
+
+
+@dataclass
+class OfflinePos:
+    pos: Pos
+    simulator: PosSimulator
+    driver: FakeWebDriver = field(repr=False)
+
+
+def build_offline_pos(latencies: SimulatorLatencies = None) -> OfflinePos:
+    """
+    Build a Pos wired to the in memory driver and simulated pinpad, watermark, prompts and receipts
+    Args:
+        latencies (SimulatorLatencies): Simulated response times, all zero if None
+    Return:
+        OfflinePos: Pos together with the simulator and driver backing it
+    """
+    simulator = PosSimulator(latencies)
+    driver = FakeWebDriver(simulator)
+    pos = Pos(driver, active_tabs=None, ip_scanner=OfflineScanner())
+    pos.pinpad = OfflinePinpad(simulator)
+    pos.number_keypad = OfflineNumberKeypad(simulator)
+    item_keys = OfflineItemKeys(pos)
+    pos.select_item_page = item_keys.select_item_page
+    pos.select_group = item_keys.select_group
+    pos.select_item_by_speedkey = item_keys.select_item_by_speedkey
+    pos.select_item_by_deptkey = item_keys.select_item_by_deptkey
+    pos.prompt_box = OfflinePromptBox(simulator)
+    pos.transaction.watermark = OfflineWatermark(simulator)
+    pos.transaction._receipt_tool = OfflineReceiptTool(simulator)
+    pos.transaction.get_last_register_receipt = simulator.last_receipt
+    return OfflinePos(pos=pos, simulator=simulator, driver=driver)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from hornets.components.pos.payment.payment import Payment
+from hornets.components.transaction.transaction_details import TransactionDetails
+from hornets.utilities.log_config import logger
+from hornets.utilities.stats import summarize
+
+
+@dataclass
+class DispenserResult:
+    dispenser: str
+    succeeded: bool
+    duration: float
+    error: str = None
+    transaction_details: dict = None
+
+
+@dataclass
+class OutsidePaymentReport:
+    results: List[DispenserResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    abandoned: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """
+        Aggregate the results into throughput, error count and latency percentiles, overall and per dispenser
+        """
+        durations = [result.duration for result in self.results if result.succeeded]
+        dispensers = sorted({result.dispenser for result in self.results})
+        return {
+            "transactions": len(self.results),
+            "errors": sum(not result.succeeded for result in self.results),
+            "elapsed": self.elapsed,
+            "abandoned": self.abandoned,
+            "throughput_per_minute": len(durations) / self.elapsed * 60 if self.elapsed else 0.0,
+            "latency": summarize(durations),
+            "dispensers": {
+                dispenser: summarize(
+                    [result.duration for result in self.results if result.dispenser == dispenser and result.succeeded]
+                )
+                for dispenser in dispensers
+            },
+        }
+
+
+def _release(loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore):
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        # The run is over and its event loop closed, nothing waits for the connection anymore
+        pass
+
+
+class OutsidePaymentEngine:
+    """
+    Run pay at the pump flows on several dispensers at once. Each CRIND flow is synchronous, so it runs on a
+    thread pool shared by every dispenser, which also caps the connections open against the simulators
+    """
+
+    def __init__(self, crinds: Dict[str, object], connections: int = 8, timeout: float = 120):
+        """
+        Args:
+            crinds (dict): CRIND of each dispenser, by dispenser name
+            connections (int): Maximum flows talking to the simulators at the same time
+            timeout (float): Seconds a single outside payment may take
+        """
+        self.crinds = crinds
+        self.connections = connections
+        self.timeout = timeout
+
+    async def _pay_at_dispenser(
+            self,
+            executor: ThreadPoolExecutor,
+            slots: asyncio.Semaphore,
+            flows: List[Tuple[str, Future]],
+            dispenser: str,
+            payment: Payment
+    ) -> DispenserResult:
+        crind = self.crinds[dispenser]
+        # The timeout only starts once a connection is free, a flow waiting for one has not started yet
+        await slots.acquire()
+        loop = asyncio.get_running_loop()
+        crind.transaction.transaction_details = TransactionDetails(indoor_transaction=False)
+        started = time.perf_counter()
+        flow = executor.submit(payment.make_outside_payment, crind)
+        # A timed out flow keeps its thread busy, so its connection is only freed when the flow ends
+        flow.add_done_callback(lambda _: _release(loop, slots))
+        flows.append((dispenser, flow))
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(flow), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Outside payment at dispenser {dispenser} timed out after {self.timeout} seconds")
+            return DispenserResult(dispenser, False, time.perf_counter() - started, error="timeout")
+        except Exception as error:
+            logger.warning(f"Outside payment at dispenser {dispenser} failed: {error}")
+            return DispenserResult(dispenser, False, time.perf_counter() - started, error=repr(error))
+        return DispenserResult(
+            dispenser,
+            True,
+            time.perf_counter() - started,
+            transaction_details=crind.transaction.transaction_details.to_dict(),
+        )
+
+    async def _pay_rounds(
+            self,
+            dispenser: str,
+            executor: ThreadPoolExecutor,
+            slots: asyncio.Semaphore,
+            flows: List[Tuple[str, Future]],
+            payment_factory,
+            rounds: int
+    ):
+        results = []
+        for _ in range(rounds):
+            results.append(await self._pay_at_dispenser(executor, slots, flows, dispenser, payment_factory()))
+            if results[-1].error == "timeout":
+                # The timed out flow may still be driving the CRIND, the dispenser is left alone from now on
+                break
+        return results
+
+    async def run(self, payment_factory: Callable[[], Payment], rounds: int = 1) -> OutsidePaymentReport:
+        """
+        Pay at every dispenser concurrently, one transaction after another on each dispenser
+        Args:
+            payment_factory (Callable): Builds the Payment used for each transaction
+            rounds (int): Transactions to run on each dispenser
+        Return:
+            OutsidePaymentReport: Result of every transaction
+        """
+        started = time.perf_counter()
+        flows: List[Tuple[str, Future]] = []
+        # A thread running a CRIND flow cannot be stopped, so the executor is not joined: a hung flow would
+        # block the event loop forever and the per dispenser timeout would not bound the run
+        executor = ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="crind")
+        slots = asyncio.Semaphore(self.connections)
+        try:
+            per_dispenser = await asyncio.gather(*(
+                self._pay_rounds(dispenser, executor, slots, flows, payment_factory, rounds)
+                for dispenser in self.crinds
+            ))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        abandoned = sorted({dispenser for dispenser, flow in flows if not flow.done()})
+        if abandoned:
+            logger.warning(f"Outside payment flows still running and abandoned at dispensers: {abandoned}")
+        return OutsidePaymentReport(
+            results=[result for results in per_dispenser for result in results],
+            elapsed=time.perf_counter() - started,
+            abandoned=abandoned,
+        )
+
+    def run_sync(self, payment_factory: Callable[[], Payment], rounds: int = 1) -> OutsidePaymentReport:
+        return asyncio.run(self.run(payment_factory, rounds))
@@ -1,22 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 from hornets.components.pos.payment.payment_method import (
     CreditCardPaymentMethod,
     PaymentMethod,
 )
+from hornets.utilities.tracing import traced, tracer
 
 class Payment:
-    def __init__(self, *payment_method: PaymentMethod):
+    def __init__(self, *payment_method: PaymentMethod, pipelined: bool = False):
+        """
+        Args:
+            payment_method (PaymentMethod): Tenders, paid in the given order
+            pipelined (bool): Prepare the card data of the next tenders in the background while a tender is paid.
+                              The tenders are still paid one after another, in order, on the POS
+        """
         self.payment_method = payment_method
+        self.pipelined = pipelined
 
+    @traced("Payment.make_payment")
     def make_payment(self, pos, select_tender: bool = False):
         pos.transaction.transaction_details.payment_method = self.payment_method
-        for method in self.payment_method:
-            if select_tender:
-                method.select_tender(pos)
-            if method.is_electronic_payment_method():
-                method.select_payment_type(pos)
+        if not self.pipelined:
+            for method in self.payment_method:
+                self._pay_tender(pos, method, select_tender)
+            return
+        # A single worker prepares the tenders in order, never touching the POS
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tender-preparation")
+        try:
+            preparations = [executor.submit(method.prepare) for method in self.payment_method]
+            for method, preparation in zip(self.payment_method, preparations):
+                with tracer.span(f"{type(method).__name__}.prepare"):
+                    preparation.result()
+                self._pay_tender(pos, method, select_tender)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pay_tender(self, pos, method: PaymentMethod, select_tender: bool):
+        if select_tender:
+            method.select_tender(pos)
+        if method.is_electronic_payment_method():
+            method.select_payment_type(pos)
+            with tracer.span("Pinpad.wait_for_pinpad_to_be_ready"):
                 pos.pinpad.wait_for_pinpad_to_be_ready()
+        with tracer.span(f"{type(method).__name__}.pay_with"):
             method.pay_with(pos)
 
     def make_outside_payment(self, crind):
@@ -29,6 +56,9 @@ class Payment:
     def has_electronic_payment(self):
         return any(method.is_electronic_payment_method() for method in self.payment_method)
 
+    def may_prompt(self):
+        return any(method.may_prompt() for method in self.payment_method)
+
 class NoPayment(Payment):
 
     def __init__(self):
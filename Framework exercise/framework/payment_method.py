@@ -6,10 +6,12 @@ from hornets.base_enum import BaseEnum
 from hornets.components.pos.config.refund_config import RefundConfig
 from hornets.components.pos.enums import PaymentMethodName, PosStateName
 from hornets.utilities.log_config import logger
-from libs.simulators_interface.pinpadsim.enums import PinpadMessage
 from hornets.utilities.iterables import get_iterable
+from hornets.utilities.lazy_import import lazy_import
 from hornets.components.el.el_locators import ReceiptJournalLocators
 
+PinpadMessage = lazy_import("libs.simulators_interface.pinpadsim.enums", "PinpadMessage")
+
 
 class PaymentMethod(ABC):
     def __init__(self, payment_method: PaymentMethodName, tender_button: BaseEnum, needs_pinpad: bool = False):
@@ -27,6 +29,19 @@ class PaymentMethod(ABC):
     def select_payment_type(self, pos):
         pass
 
+    def prepare(self):
+        """
+        Load the data the tender needs, such as card data, without using the POS.
+        Run in the background for the next tenders of a pipelined Payment
+        """
+        pass
+
+    def may_prompt(self) -> bool:
+        """
+        Whether paying with this tender can leave a prompt on the POS, such as a partial approval
+        """
+        return False
+
     def pay_express_lane_with(self, el, loyalty):
         raise NotImplementedError
 
@@ -63,6 +78,13 @@ class CreditCardPaymentMethod(PaymentMethod):
         self.refund_config = refund_config
         self.manual_entry = manual_entry
 
+    def prepare(self):
+        if hasattr(self.credit_card, "prepare"):
+            self.credit_card.prepare()
+
+    def may_prompt(self) -> bool:
+        return bool(self.credit_card_limit or self.offline_limit)
+
     def pay_with(self, pos):
         pos.pinpad.wait_for_pinpad_card_action()
         self.process_indoor_payment(pos, self.manual_entry)
@@ -75,14 +97,17 @@ class CreditCardPaymentMethod(PaymentMethod):
         crind._process_outside_payment_with_card(self.credit_card)
 
     def process_indoor_payment(self, pos, manual_entry):
-        pos._set_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+        pos._change_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
         if manual_entry:
             self.credit_card.process_manual_payment(pos)
         else:
             self.credit_card.process_payment(pos)
 
     def process_credit_card_limit(self, pos):
-        if float(self.credit_card_limit) < float(pos.get_transaction_total_amount()):
+        # The partial approval prompt only shows once the card has been presented
+        pos.state_machine.requires(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+        total_amount = pos.get_transaction_total_amount()
+        if float(self.credit_card_limit) < float(total_amount):
             logger.info(f"Processing transaction with credit card limit for ${self.credit_card_limit}")
             pos.prompt_box.wait_for_pos_prompt(
                 PosPrompt.PARTIAL_APPROVAL,
@@ -91,7 +116,7 @@ class CreditCardPaymentMethod(PaymentMethod):
             pos.answer_to_prompt(PosPrompt.PARTIAL_APPROVAL, PosPromptBoxLocators.YES)
         else:
             logger.info(f"The credit card limit ({self.credit_card_limit}) exceeds the total transaction amount"
-                        f" ({pos.get_transaction_total_amount()})."
+                        f" ({total_amount})."
                         f" Proceeding with the transaction.")
 
 
@@ -105,9 +130,16 @@ class DebitCardPaymentMethod(PaymentMethod):
         self.debit_card = debit_card
         self.cashback_amount = cashback_amount
 
+    def prepare(self):
+        if hasattr(self.debit_card, "prepare"):
+            self.debit_card.prepare()
+
+    def may_prompt(self) -> bool:
+        return bool(self.cashback_amount)
+
     def pay_with(self, pos):
         pos.pinpad.wait_for_pinpad_card_action()
-        pos._set_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+        pos._change_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
         self.debit_card.process_payment(pos, cashback_amount=self.cashback_amount)
         pos.transaction.transaction_details.cashback = True if self.cashback_amount else False
 
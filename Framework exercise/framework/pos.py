@@ -1,5 +1,6 @@
 import re
-from typing import Union
+from functools import cached_property
+from typing import List, Union
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.common import TimeoutException as SeleniumTimeoutException
@@ -18,9 +19,6 @@ from hornets.components.exceptions import (
     TransactionNotVoidableException,
     NoBufferAvailableException,
 )
-from hornets.components.keypad.keyboard_keypad import PosKeyboardKeypad
-from hornets.components.keypad.number_keypad import PosNumberKeyPad
-from hornets.components.pinpad import Pinpad
 from hornets.components.pos.constants import PINPAD_ERROR_IN_POS
 from hornets.components.pos.enums import (
     PayMode,
@@ -37,7 +35,8 @@ from hornets.components.pos.payment.payment_method import (
 )
 from hornets.components.pos.payment.payment import Payment, NoPayment
 from hornets.components.pos.receipts.receipt import Receipt
-from hornets.components.pos.receipts.receipts_searcher import IndoorReceiptSearcher
+from hornets.components.pos.lanes import Lane, SignOnLocators
+from hornets.components.pos.pos_state_machine import PosLifecycleState, PosStateMachine
 from hornets.components.pos.pos_locators import (
     PosMainLocators,
     FunctionKeysLocators,
@@ -47,21 +46,62 @@ from hornets.components.pos.pos_locators import (
     SelectionListLocators,
     JournalDisplayLocators,
 )
+from hornets.components.transaction.enums import WatermarkDisplay
 from hornets.components.transaction.transaction import PosTransaction
+from hornets.utilities.batch import BatchCommandsMixin
+from hornets.utilities.dom_waiter import DomWaiter
+from hornets.utilities.lazy_import import lazy_import
+from hornets.utilities.locators import ElementCache
+from hornets.utilities.log_config import logger
+from hornets.utilities.tracing import traced, tracer
 
-class Pos(Base):
-    def __init__(self, driver: WebDriver, active_tabs, ip_scanner=None):
+PosKeyboardKeypad = lazy_import("hornets.components.keypad.keyboard_keypad", "PosKeyboardKeypad")
+PosNumberKeyPad = lazy_import("hornets.components.keypad.number_keypad", "PosNumberKeyPad")
+Pinpad = lazy_import("hornets.components.pinpad", "Pinpad")
+IndoorReceiptSearcher = lazy_import("hornets.components.pos.receipts.receipts_searcher", "IndoorReceiptSearcher")
+ReceiptTool = lazy_import("hornets.tools.receipt.tool", "ReceiptTool")
+
+class Pos(BatchCommandsMixin, Base):
+    def __init__(self, driver: WebDriver, active_tabs, ip_scanner=None, lane: Lane = None):
         super().__init__(driver, active_tabs)
+        tracer.instrument_driver(self.driver)
+        self.lane = lane
         self.printer_installed = False
-        self.number_keypad = PosNumberKeyPad(self.driver)
-        self.keyboard = PosKeyboardKeypad(self.driver)
-        self.transaction = PosTransaction(self.driver)
+        self.transaction = PosTransaction(
+            self.driver, receipt_tool=ReceiptTool(**lane.receipt_tool_options) if lane else None
+        )
         self.prompt_box = PromptBox(self.driver)
         self.header = Header(self.driver)
-        self.pinpad = Pinpad(self.driver, self, pinpad_locator=PosMainLocators.PINPAD_PROCESSING_TEXT)
-        self.scanner = ip_scanner or IpScanner()
+        self.dom_waiter = DomWaiter(self.driver)
+        self.element_cache = ElementCache(self.driver)
+        self.scanner = ip_scanner or IpScanner(**(lane.scanner_options if lane else {}))
         self.pay_mode = PayMode.DEFAULT
         self.pos_state = UnknownPosState()
+        self._speed_key_navigation = None
+        self.state_machine = PosStateMachine(
+            verifiers={
+                PosStateName.IN_TRANSACTION: self._is_basket_displayed,
+                PosStateName.IN_TRANSACTION_SELECTING_TENDER: self._is_tender_selection_displayed,
+                PosLifecycleState.TRANSACTION_COMPLETED: self._is_transaction_completed_displayed,
+            }
+        )
+
+    @cached_property
+    def number_keypad(self) -> PosNumberKeyPad:
+        return PosNumberKeyPad(self.driver)
+
+    @cached_property
+    def keyboard(self) -> PosKeyboardKeypad:
+        return PosKeyboardKeypad(self.driver)
+
+    @cached_property
+    def pinpad(self) -> Pinpad:
+        return Pinpad(
+            self.driver,
+            self,
+            pinpad_locator=PosMainLocators.PINPAD_PROCESSING_TEXT,
+            **(self.lane.pinpad_options if self.lane else {})
+        )
 
     @staticmethod
     def _get_payment(payment: Payment, pay_mode: PayMode) -> Payment | NoPayment:
@@ -77,6 +117,7 @@ class Pos(Base):
             return NoPayment()
         return payment
 
+    @traced("Pos.select_item")
     def select_item(
             self,
             item: str = "Item 1",
@@ -102,11 +143,18 @@ class Pos(Base):
             restricted_item_config: (class object) Configuration for restricted Item
             qualifier_item_config: (class object) Configuration for qualifier Item
         """
+        self.transaction.snapshot_receipt_baseline()
+        self.state_machine.requires(
+            PosLifecycleState.IDLE, PosStateName.IN_TRANSACTION, PosLifecycleState.TRANSACTION_COMPLETED
+        )
         self.transaction.transaction_details.is_drystock = True
+        navigation = (page, from_group)
         match selection_method:
             case ItemSelectionMethod.SPEED_KEY:
-                self.select_item_page(page)
-                self.select_group(from_group)
+                if self._speed_key_navigation != (*navigation, self.pos_state):
+                    self.invalidate_speed_key_navigation()
+                    self.select_item_page(page)
+                    self.select_group(from_group)
                 self.select_item_by_speedkey(item)
             case ItemSelectionMethod.PLU:
                 self.select_item_by_plu(item)
@@ -125,8 +173,51 @@ class Pos(Base):
         except ElementNotFoundException:
             raise ValueError("Please provide correct value to enter")
 
-        self._set_pos_state(PosStateName.IN_TRANSACTION)
+        self._change_pos_state(PosStateName.IN_TRANSACTION)
+        item_configs = (carwash, restricted_item_config, qualifier_item_config)
+        prompt_expected = any(config is not None for config in item_configs)
+        if prompt_expected:
+            self.state_machine.note_prompt_source("select_item")
+        if selection_method == ItemSelectionMethod.SPEED_KEY and not prompt_expected:
+            self._speed_key_navigation = (*navigation, self.pos_state)
+        else:
+            self.invalidate_speed_key_navigation()
+
+    def select_items(self, items: List[dict]):
+        """
+        Select several items, ordered by speed key page and group so each page and group is navigated once.
+        Items are added to the basket in that order, not in the given one
+        Args:
+            items (List[dict]): select_item arguments for each item
+        """
+        for item in sorted(items, key=lambda item: (item.get("page", 1), item.get("from_group") or "")):
+            self.select_item(**item)
+
+    def _change_pos_state(self, state: PosStateName):
+        """
+        Move the POS to a new state through the state machine, which checks the transition is allowed
+        """
+        self.state_machine.transition(state)
+        self._set_pos_state(state)
+
+    def _is_basket_displayed(self) -> bool:
+        return self.transaction._get_transaction_total_amount()["basket_count"] > 0
+
+    def _is_tender_selection_displayed(self) -> bool:
+        with self.batch() as batch:
+            card_key = batch.element_exists(FunctionKeysLocators.CARD)
+        return bool(card_key.value)
 
+    def _is_transaction_completed_displayed(self) -> bool:
+        return self.transaction.watermark.status == WatermarkDisplay.TRANSACTION_COMPLETED
+
+    def invalidate_speed_key_navigation(self):
+        """
+        Forget the speed key page and group shown by the POS, the next speed key selection navigates again
+        """
+        self._speed_key_navigation = None
+
+    @traced("Pos._process_pay_mode")
     def _process_pay_mode(self, payment: Payment, pay_mode: PayMode, loyalty: Loyalty, donation: Donation):
         """
         Process the payment mode
@@ -136,14 +227,14 @@ class Pos(Base):
         logger.info(f"POS Pay - Selected PayMode: {self.pay_mode}")
         match self.pay_mode:
             case PayMode.DEFAULT:
-                self.click(FunctionKeysLocators.PAY)
+                self.element_cache.click(FunctionKeysLocators.PAY)
                 donation.process(self)
                 loyalty.process_indoor(self)
-                self._set_pos_state(PosStateName.IN_TRANSACTION_SELECTING_TENDER)
+                self._change_pos_state(PosStateName.IN_TRANSACTION_SELECTING_TENDER)
                 payment.make_payment(self, select_tender=True)
             case PayMode.ONLY_CARDS:
                 loyalty.process_indoor(self)
-                self._set_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+                self._change_pos_state(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
                 if not payment.has_electronic_payment():
                     raise PaymentNotPerformedException("Only electronic payments are supported")
                 payment.make_payment(self)
@@ -169,19 +260,64 @@ class Pos(Base):
         Return:
             dict: Transaction completed
         """
+        # Flows that do not go through select_item start the transaction here
+        self.transaction.snapshot_receipt_baseline()
+        self.invalidate_speed_key_navigation()
+        self.state_machine.requires(PosStateName.IN_TRANSACTION)
         payment = self._get_payment(payment, pay_mode)
+        if payment.may_prompt() or not isinstance(loyalty, NoLoyalty) or not isinstance(donation, NoDonation):
+            self.state_machine.note_prompt_source("pay")
         self._process_pay_mode(payment, pay_mode, loyalty, donation)
-        self._check_for_additional_prompts(payment, expected_error)
+        if self.state_machine.consume_prompt_sources() or expected_error:
+            self._check_for_additional_prompts(payment, expected_error)
         gift_card.activation_or_recharge_process(self)
         self._post_payment_actions(payment)
         return self.transaction.to_dict(after_payment=True)
 
+    @traced("Pos._post_payment_actions")
     def _post_payment_actions(self, payment: Payment):
         """
         Confirm the transaction has been completed
         """
+        if self.pay_mode != PayMode.ZERO_AMOUNT_TRANSACTION:
+            # A zero amount transaction is closed by the POS without any tender
+            self.state_machine.requires(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
         if payment.has_electronic_payment():
-            self.pinpad.wait_for_pinpad_transaction_completion()
-        self.transaction.wait_for_transaction_to_be_completed()
+            # The pinpad component stays the authority: the processing text being absent can also mean
+            # processing has not started yet
+            with tracer.span("Pinpad.wait_for_pinpad_transaction_completion"):
+                self.pinpad.wait_for_pinpad_transaction_completion()
+        if self.transaction.wait_for_transaction_to_be_completed():
+            self.state_machine.transition(PosLifecycleState.TRANSACTION_COMPLETED)
+
+    def sign_on(self, operator_id: str, password: str = None):
+        """
+        Sign an operator on from the POS sign on screen
+        Args:
+            operator_id (str): Operator ID
+            password (str): Operator password, if the operator has one
+        """
+        logger.info(f"Signing on operator {operator_id}")
+        self.click(SignOnLocators.SIGN_ON)
+        self.number_keypad.enter_value(operator_id)
+        if password is not None:
+            self.number_keypad.enter_value(password)
+        self.state_machine.reset()
+
+    def reset(self):
+        """
+        Bring the POS back to idle so the same instance, and its browser session, can be reused by the next test.
+        An open transaction is voided, transaction details are cleared and pay mode and POS state go back to default
+        """
+        transaction_open = self.transaction._get_transaction_total_amount()["basket_count"] > 0
+        if transaction_open and self.transaction.watermark.status != WatermarkDisplay.TRANSACTION_COMPLETED:
+            logger.info("POS reset - Voiding the transaction left open by the previous test")
+            self.void_transaction()
+        self.transaction.reset()
+        self.element_cache.invalidate()
+        self.invalidate_speed_key_navigation()
+        self.state_machine.reset()
+        self.pay_mode = PayMode.DEFAULT
+        self.pos_state = UnknownPosState()
 
     
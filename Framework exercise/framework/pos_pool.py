@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from hornets.components.pos.lanes import Lane
+from hornets.components.pos.pos import Pos
+from hornets.utilities.log_config import logger
+
+
+class PosPool:
+    """
+    Keep warm Pos instances, with their browser sessions and component graphs, to be reused across tests.
+    Instances are reset before being handed out. When the reset fails the browser session is quit and replaced
+    by a new one, so a dead WebDriver session is never handed out again
+    """
+
+    def __init__(
+            self,
+            create_driver: Callable[[], WebDriver],
+            create_pos: Callable[[WebDriver], Pos],
+            owns_drivers: bool = True
+    ):
+        """
+        Args:
+            create_driver (Callable): Opens a new browser session on the POS
+            create_pos (Callable): Builds a Pos ready to be used on a browser session
+            owns_drivers (bool): Whether the pool quits the sessions it replaces and the ones left on close.
+                                 When False the session belongs to the caller and cannot be replaced
+        """
+        self._create_driver = create_driver
+        self._create_pos = create_pos
+        self.owns_drivers = owns_drivers
+        self._idle: List[Pos] = []
+        self._created: List[Pos] = []
+
+    def _create(self) -> Pos:
+        pos = self._create_pos(self._create_driver())
+        self._created.append(pos)
+        return pos
+
+    def _discard(self, pos: Pos):
+        self._created.remove(pos)
+        if not self.owns_drivers:
+            return
+        try:
+            pos.driver.quit()
+        except Exception as error:
+            logger.warning(f"Browser session of the discarded POS could not be quit: {error!r}")
+
+    def acquire(self) -> Pos:
+        """
+        Get an idle Pos from the pool, or a new one if none is available
+        Return:
+            Pos: Pos in idle state
+        """
+        if not self._idle:
+            return self._create()
+        pos = self._idle.pop()
+        try:
+            pos.reset()
+        except Exception as error:
+            self._discard(pos)
+            if not self.owns_drivers:
+                logger.warning(f"POS reset failed on a browser session the pool does not own: {error!r}")
+                raise
+            logger.warning(f"POS reset failed, replacing the browser session: {error!r}")
+            pos = self._create()
+        return pos
+
+    def release(self, pos: Pos):
+        """
+        Give a Pos back to the pool
+        Args:
+            pos (Pos): Pos previously returned by acquire
+        """
+        self._idle.append(pos)
+
+    @contextmanager
+    def lease(self) -> Iterator[Pos]:
+        """
+        Acquire a Pos for the duration of a with block and give it back to the pool afterwards
+        """
+        pos = self.acquire()
+        try:
+            yield pos
+        finally:
+            self.release(pos)
+
+    def close(self):
+        """
+        Drop the instances, quitting their browser sessions if the pool owns them
+        """
+        for pos in list(self._created):
+            self._discard(pos)
+        self._idle.clear()
+
+
+def lane_session_factories(lane: Lane) -> Tuple[Callable[[], WebDriver], Callable[[WebDriver], Pos]]:
+    """
+    Build the PosPool factories of a lane: browser sessions open the lane POS web app and the Pos built on them
+    signs the lane operator on
+    Args:
+        lane (Lane): Lane the sessions are opened on
+    Return:
+        tuple: create_driver and create_pos callables
+    """
+    def create_driver() -> WebDriver:
+        driver = webdriver.Remote(command_executor=lane.webdriver_url, options=webdriver.ChromeOptions())
+        driver.get(lane.pos_url)
+        return driver
+
+    def create_pos(driver: WebDriver) -> Pos:
+        pos = Pos(driver, active_tabs=None, lane=lane)
+        if lane.operator_id is not None:
+            pos.sign_on(lane.operator_id, lane.operator_password)
+        return pos
+    return create_driver, create_pos
@@ -0,0 +1,118 @@
+import os
+from typing import Callable, Dict, Set
+
+from hornets.base_enum import BaseEnum
+from hornets.components.pos.enums import PosStateName
+from hornets.utilities.log_config import logger
+
+STRICT_STATE_ENV_VAR = "HORNETS_STRICT_POS_STATE"
+
+
+class PosLifecycleState(BaseEnum):
+    """
+    States tracked by the state machine only, around the in-transaction states of PosStateName
+    """
+    IDLE = "idle"
+    TRANSACTION_COMPLETED = "transaction completed"
+
+
+MachineState = PosStateName | PosLifecycleState
+
+ALLOWED_TRANSITIONS: Dict[MachineState, Set[MachineState]] = {
+    PosLifecycleState.IDLE: {
+        PosStateName.IN_TRANSACTION,
+    },
+    PosStateName.IN_TRANSACTION: {
+        PosStateName.IN_TRANSACTION,
+        PosStateName.IN_TRANSACTION_SELECTING_TENDER,
+        PosStateName.IN_TRANSACTION_AFTER_PAYMENT,
+        # Zero amount transactions
+        PosLifecycleState.TRANSACTION_COMPLETED,
+    },
+    PosStateName.IN_TRANSACTION_SELECTING_TENDER: {
+        PosStateName.IN_TRANSACTION_AFTER_PAYMENT,
+    },
+    PosStateName.IN_TRANSACTION_AFTER_PAYMENT: {
+        PosStateName.IN_TRANSACTION_SELECTING_TENDER,
+        PosStateName.IN_TRANSACTION_AFTER_PAYMENT,
+        PosLifecycleState.TRANSACTION_COMPLETED,
+    },
+    PosLifecycleState.TRANSACTION_COMPLETED: {
+        PosLifecycleState.IDLE,
+        PosStateName.IN_TRANSACTION,
+    },
+}
+
+
+class InvalidPosStateException(Exception):
+    pass
+
+
+class PosStateMachine:
+    """
+    Track the POS state through its allowed transitions and the actions that may have left a prompt on screen,
+    so checks already guaranteed by the current state can be skipped. The state is unknown (None) until the POS
+    is reset or a transaction starts, an unknown state allows any transition and guarantees nothing.
+    In strict mode every transition is also verified against the POS screen, for debugging
+    """
+
+    def __init__(self, verifiers: Dict[MachineState, Callable[[], bool]] = None, strict: bool = None):
+        """
+        Args:
+            verifiers (dict): Checks on the POS screen confirming each state, used in strict mode
+            strict (bool): Raise on disallowed transitions and verify states, from HORNETS_STRICT_POS_STATE if None
+        """
+        self.verifiers = verifiers or {}
+        self.strict = os.environ.get(STRICT_STATE_ENV_VAR, "") not in ("", "0") if strict is None else strict
+        self.state: MachineState | None = None
+        self._prompt_sources: list = []
+
+    def transition(self, state: MachineState):
+        """
+        Move to a new state
+        Args:
+            state (MachineState): State the POS moves to
+        """
+        allowed = ALLOWED_TRANSITIONS.get(self.state)
+        if allowed is not None and state not in allowed:
+            message = f"POS state cannot change from {self.state} to {state}"
+            if self.strict:
+                raise InvalidPosStateException(message)
+            logger.warning(message)
+        self.state = state
+        if self.strict and state in self.verifiers and not self.verifiers[state]():
+            raise InvalidPosStateException(f"POS screen does not match state {state}")
+
+    def requires(self, *states: MachineState):
+        """
+        Check an action precondition. An unknown state satisfies any precondition
+        Args:
+            states (MachineState): States the action can run in
+        """
+        if self.state is not None and self.state not in states:
+            message = f"Action requires POS state in {[str(state) for state in states]}, current state is {self.state}"
+            if self.strict:
+                raise InvalidPosStateException(message)
+            logger.warning(message)
+
+    def note_prompt_source(self, action: str):
+        """
+        Record an action that may leave a prompt on the POS screen
+        """
+        self._prompt_sources.append(action)
+
+    def consume_prompt_sources(self) -> bool:
+        """
+        Whether an action that may leave a prompt happened since the last call.
+        Always True while the state is unknown, since the POS may have been left with a prompt on screen
+        """
+        prompt_possible = self.state is None or bool(self._prompt_sources)
+        self._prompt_sources = []
+        return prompt_possible
+
+    def reset(self):
+        """
+        Back to idle, once the POS has been brought there
+        """
+        self.state = PosLifecycleState.IDLE
+        self._prompt_sources = []
@@ -0,0 +1,64 @@
+"""
+Import time profile of the framework, as measured by python -X importtime in a fresh interpreter.
+
+    python -m hornets.utilities.startup_profile hornets.components.pos.pos --top 25
+"""
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_time: float
+    cumulative_time: float
+    depth: int
+
+
+def profile_imports(modules: List[str], python: str = sys.executable) -> List[ImportTiming]:
+    """
+    Import the modules in a fresh interpreter and get the time spent importing each module
+    Args:
+        modules (List[str]): Modules to import
+        python (str): Interpreter to use
+    Return:
+        list: Timing of every module imported, in seconds
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([python, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    timings = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2))
+    return timings
+
+
+def format_report(timings: List[ImportTiming], top: int = 20) -> str:
+    total = sum(timing.self_time for timing in timings)
+    slowest = sorted(timings, key=lambda timing: timing.cumulative_time, reverse=True)[:top]
+    lines = [f"{len(timings)} modules imported in {total:.3f}s", f"{'cumulative':>10} {'self':>8}  module"]
+    lines += [
+        f"{timing.cumulative_time:>9.3f}s {timing.self_time:>7.3f}s  {'  ' * timing.depth}{timing.module}"
+        for timing in slowest
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="+")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    print(format_report(profile_imports(args.modules), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import math
+from typing import Dict, Iterable, List
+
+
+def percentile(values: Iterable[float], pct: float) -> float | None:
+    """
+    Get a percentile of the values, interpolating between the closest ranks
+    Args:
+        values (Iterable[float]): Samples
+        pct (float): Percentile to get, from 0 to 100
+    Return:
+        float | None: Percentile value, None if there are no samples
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: List[float]) -> Dict[str, float | int | None]:
+    """
+    Get count, p50, p95 and max of the values
+    Args:
+        values (List[float]): Samples
+    Return:
+        dict: Summary of the samples
+    """
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": max(values) if values else None,
+    }
@@ -0,0 +1,170 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from hornets.utilities.stats import summarize
+
+TRACE_ENV_VAR = "HORNETS_TRACE"
+
+
+@dataclass
+class Span:
+    name: str
+    duration: float = 0.0
+    webdriver_commands: int = 0
+    children: List["Span"] = field(default_factory=list)
+    measures: Dict[str, float] = field(default_factory=dict)
+
+
+class Tracer:
+    """
+    Opt-in recorder of nested action spans with their wall time and the WebDriver commands issued within them.
+    Enabled with the HORNETS_TRACE environment variable.
+    Spans, their nesting and command counts are kept per thread, so actions run in parallel on several lanes,
+    like the load generator does, do not nest into each other or mix their command counts
+    """
+
+    def __init__(self, enabled: bool = None):
+        self.enabled = os.environ.get(TRACE_ENV_VAR, "") not in ("", "0") if enabled is None else enabled
+        self._local = threading.local()
+
+    def _thread_state(self) -> threading.local:
+        state = self._local
+        if not hasattr(state, "stack"):
+            state.roots = []
+            state.stack = []
+            state.webdriver_commands = 0
+        return state
+
+    @property
+    def roots(self) -> List[Span]:
+        return self._thread_state().roots
+
+    def instrument_driver(self, driver: WebDriver):
+        """
+        Count the commands sent through the driver. Does nothing if tracing is disabled or already instrumented
+        Args:
+            driver (WebDriver): Driver to instrument
+        """
+        if not self.enabled or getattr(driver, "_traced", False):
+            return
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def counting_execute(*args, **kwargs):
+            self._thread_state().webdriver_commands += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counting_execute
+        driver._traced = True
+
+    @contextmanager
+    def span(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        state = self._thread_state()
+        span = Span(name)
+        (state.stack[-1].children if state.stack else state.roots).append(span)
+        state.stack.append(span)
+        commands = state.webdriver_commands
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - started
+            span.webdriver_commands = state.webdriver_commands - commands
+            state.stack.pop()
+
+    def measure(self, name: str, value: float):
+        """
+        Attach a measure, like a latency observed in the browser, to the innermost open span of the thread
+        Args:
+            name (str): Measure name
+            value (float): Measured value
+        """
+        if not self.enabled:
+            return
+        state = self._thread_state()
+        if state.stack:
+            state.stack[-1].measures[name] = value
+
+    def collect(self) -> List[Span]:
+        """
+        Get the spans recorded so far by the calling thread and start over
+        Return:
+            list: Root spans
+        """
+        state = self._thread_state()
+        roots, state.roots, state.stack = state.roots, [], []
+        return roots
+
+
+tracer = Tracer()
+
+
+def traced(name: str = None) -> Callable:
+    """
+    Record every call of the decorated function as a span
+    Args:
+        name (str): Span name, the function qualified name if None
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceReport:
+    """
+    Aggregate spans across tests into per action latency and command count percentiles
+    """
+
+    def __init__(self):
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._commands: Dict[str, List[float]] = defaultdict(list)
+        self._measures: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    def add(self, spans: List[Span]):
+        for span in spans:
+            self._durations[span.name].append(span.duration)
+            self._commands[span.name].append(span.webdriver_commands)
+            for measure, value in span.measures.items():
+                self._measures[span.name][measure].append(value)
+            self.add(span.children)
+
+    def to_dict(self) -> dict:
+        return {
+            name: {
+                "wall_time": summarize(durations),
+                "webdriver_commands": summarize(self._commands[name]),
+                **{measure: summarize(values) for measure, values in self._measures[name].items()},
+            }
+            for name, durations in sorted(self._durations.items())
+        }
+
+
+def write_trace(path: Path, test_name: str, spans: List[Span]):
+    """
+    Write the spans of a single test as JSON
+    Args:
+        path (Path): Output file
+        test_name (str): Test the spans belong to
+        spans (List[Span]): Root spans of the test
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"test": test_name, "spans": [asdict(span) for span in spans]}, indent=2))
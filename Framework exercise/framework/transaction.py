@@ -7,17 +7,25 @@ from hornets.base_enum import BaseEnum
 from hornets.components.el.el_locators import ReceiptJournalLocators
 from hornets.components.exceptions import ReceiptNotFoundException
 from hornets.components.transaction.enums import WatermarkDisplay, ScreenMessageDisplay
-from hornets.components.pos.pos_locators import JournalDisplayLocators
+from hornets.components.transaction.journal_scraper import JournalScraper, JournalSnapshot
+from hornets.components.pos.pos_locators import JournalDisplayLocators, PosMainLocators
 from hornets.base import Base
 from hornets.components.transaction.screen_message import ScreenMessage
 from hornets.components.transaction.transaction_details import TransactionDetails
 from hornets.components.transaction.watermark import Watermark
-from hornets.tools.receipt.tool import ReceiptTool
+from hornets.utilities.dom_waiter import DomWaiter
+from hornets.utilities.batch import BatchCommandsMixin
 from hornets.utilities.constants import POLLING_TIMEOUT, POLLING_STEP
+from hornets.utilities.lazy_import import lazy_import
 from hornets.utilities.log_config import logger
 from hornets.utilities.polling_wrapper import poll_until_true
+from hornets.utilities.tracing import traced
 
-class Transaction(Base):
+ReceiptTool = lazy_import("hornets.tools.receipt.tool", "ReceiptTool")
+# Only POS builds whose locators define the watermark element get the DOM wait, the others poll the Watermark
+WATERMARK_LOCATOR = getattr(PosMainLocators, "WATERMARK", None)
+
+class Transaction(BatchCommandsMixin, Base):
 
     def __init__(self, driver: WebDriver, transaction_locators):
         super().__init__(driver)
@@ -37,28 +45,72 @@ class Transaction(Base):
 
 class PosTransaction(Transaction):
 
-    def __init__(self, driver: WebDriver):
+    def __init__(self, driver: WebDriver, bulk_scrape: bool = True, receipt_tool: ReceiptTool = None):
         super().__init__(driver, transaction_locators=JournalDisplayLocators)
+        self.bulk_scrape = bulk_scrape
+        self.journal_scraper = JournalScraper(self.driver, JournalDisplayLocators)
+        self._journal_snapshot = None
         self.transaction_details = TransactionDetails()
         self.watermark = Watermark(self.driver)
+        self.dom_waiter = DomWaiter(self.driver)
+        self.receipt = None
+        self._receipt_tool = receipt_tool
+        self._last_receipt_number = None
+        self.complete_fueling_after_payment = False
+        self.fuel_selection_to_dispense = None
+
+    @property
+    def receipt_tool(self) -> ReceiptTool:
+        if self._receipt_tool is None:
+            self._receipt_tool = ReceiptTool()
+        return self._receipt_tool
+
+    @property
+    def last_receipt_number(self) -> int | None:
+        """
+        Number of the last indoor receipt printed before this transaction, as captured by
+        snapshot_receipt_baseline when the transaction started. Never read lazily: read after payment,
+        the receipt just printed would become the baseline
+        """
+        return self._last_receipt_number
+
+    @last_receipt_number.setter
+    def last_receipt_number(self, receipt_number: int):
+        self._last_receipt_number = receipt_number
+
+    def snapshot_receipt_baseline(self):
+        """
+        Capture the receipt baseline when the transaction starts, if it has not been captured yet
+        """
+        if self._last_receipt_number is None:
+            self._last_receipt_number = self.receipt_tool.get_last_indoor_receipt_number()
+            logger.debug(f"Receipt baseline captured: {self._last_receipt_number}")
+
+    def reset(self):
+        """
+        Forget the state of the previous transaction so the instance can be reused for a new one
+        """
+        self.transaction_details = TransactionDetails()
         self.receipt = None
-        self.last_receipt_number = ReceiptTool().get_last_indoor_receipt_number()
+        self._journal_snapshot = None
+        self._last_receipt_number = None
         self.complete_fueling_after_payment = False
         self.fuel_selection_to_dispense = None
 
+    @traced("PosTransaction.to_dict")
     def to_dict(self, after_payment: bool = False) -> dict:
         """
         Return the transaction display as a dict
         Return:
             dict: Transaction display as a dict
         """
-
+        journal = self.snapshot().to_dict()
         return {
             "journal_display": {
-                "items": self._get_transaction_items(),
-                "total_amount": self._get_transaction_total_amount(),
+                "items": journal["items"],
+                "total_amount": journal["total_amount"],
                 "discounts": {
-                    "transaction_discounts": self._get_transaction_discounts(),
+                    "transaction_discounts": journal["transaction_discounts"],
                     "item_discounts": self._get_items_discounts(),
                 },
                 "loyalties": self.get_loyalties(),
@@ -68,23 +120,54 @@ class PosTransaction(Transaction):
             **self.transaction_details.to_dict(),
         }
 
+    def snapshot(self) -> JournalSnapshot:
+        """
+        Read the journal display, reusing the rows unchanged since the previous snapshot.
+        Uses a single script execution when bulk_scrape is enabled, element by element reads otherwise.
+        Compare two snapshots with JournalSnapshot.diff to check what an action changed
+        Return:
+            JournalSnapshot: Items, transaction discounts and total from the journal display
+        """
+        snapshot = self.journal_scraper.scrape(self._journal_snapshot) if self.bulk_scrape else None
+        if snapshot is None:
+            snapshot = JournalSnapshot(
+                items=self._get_transaction_items(),
+                transaction_discounts=self._get_transaction_discounts(),
+                total_amount=self._get_transaction_total_amount(),
+            )
+        self._journal_snapshot = snapshot
+        return snapshot
+
     def _get_transaction_total_amount(self) -> dict:
         """
-        Get the values from the total transaction
+        Get the values from the total transaction. Both values are read with a single script; when the journal is
+        re-rendering and one of them is missing, they are read again with find_element, which waits for them
         Return:
             dict: Total transaction values
         """
+        with self.batch() as batch:
+            total = batch.get_text(JournalDisplayLocators.TOTAL_AMOUNT)
+            basket_count = batch.get_text(JournalDisplayLocators.BASKET_COUNT)
+        total_text, basket_count_text = total.value, basket_count.value
+        if total_text is None or basket_count_text is None:
+            total_text = self.find_element(JournalDisplayLocators.TOTAL_AMOUNT).text
+            basket_count_text = self.find_element(JournalDisplayLocators.BASKET_COUNT).text
         return {
-            "total": self.find_element(JournalDisplayLocators.TOTAL_AMOUNT).text.replace("$", ""),
-            "basket_count": int(self.find_element(JournalDisplayLocators.BASKET_COUNT).text),
+            "total": total_text.replace("$", ""),
+            "basket_count": int(basket_count_text),
         }
 
+    @traced("Watermark.wait_for_transaction_to_be_completed")
     def wait_for_transaction_to_be_completed(self):
         """
         Wait for the transaction to be completed
         Return:
             bool: True if the transaction is completed, False otherwise
         """
+        if WATERMARK_LOCATOR is not None:
+            wait = self.dom_waiter.wait_for(WATERMARK_LOCATOR, text=WatermarkDisplay.TRANSACTION_COMPLETED.value)
+            if wait.executed:
+                return wait.satisfied
         return self.watermark.wait_for_transaction_to_be_in_status(WatermarkDisplay.TRANSACTION_COMPLETED)
 
 
@@ -1,6 +1,21 @@
 from hornets.utilities.iterables import get_iterable
 
 class TransactionDetails:
+    __slots__ = (
+        "indoor_transaction",
+        "cash_advance_requested",
+        "cash_advance_amount",
+        "additional_products",
+        "fuel_transaction",
+        "is_ngfc",
+        "is_fill_up",
+        "loyalty",
+        "payment_method",
+        "cashback",
+        "safe_drop",
+        "car_wash",
+        "is_drystock",
+    )
 
     def __init__(self, indoor_transaction: bool = True):
         self.indoor_transaction = indoor_transaction
@@ -14,13 +29,13 @@ class TransactionDetails:
         self.payment_method = None
         self.cashback = False
         self.safe_drop = None
-        self.payment_method = None
         self.car_wash = None
         self.is_drystock = False
 
     def to_dict(self):
-        if isinstance(self.payment_method, tuple) and len(self.payment_method) == 1:
-            self.payment_method = self.payment_method[0]
+        payment_method = self.payment_method
+        if isinstance(payment_method, tuple) and len(payment_method) == 1:
+            payment_method = payment_method[0]
         return {
             "fuel_transaction": self.fuel_transaction,
             "ngfc_details": {
@@ -31,6 +46,6 @@ class TransactionDetails:
             "cash_advance_requested": self.cash_advance_requested,
             "cash_advance_amount": self.cash_advance_amount,
             "loyalty": self.loyalty,
-            "payment_method": self.payment_method,
+            "payment_method": payment_method,
             "cashback": self.cashback,
         }
@@ -0,0 +1,48 @@
+import json
+import threading
+from pathlib import Path
+
+from hornets.utilities.log_config import logger
+
+
+class TransactionRecordWriter:
+    """
+    Append-only JSONL export of completed transaction records. Each record is written and flushed as soon as
+    it is received so long runs do not need to keep results in memory. Values that are not JSON types, like
+    payment methods or enums, are written as their string form
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.records_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __enter__(self) -> "TransactionRecordWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: dict):
+        """
+        Append a record, safe to call from several threads
+        Args:
+            record (dict): Transaction record, such as the dict returned by Pos.pay
+        """
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records_written += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"{self.records_written} transaction records written to {self.path}")
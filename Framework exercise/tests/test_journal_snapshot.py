@@ -0,0 +1,53 @@
+from hornets.components.transaction.journal_scraper import JournalSnapshot, _merge_rows
+
+ITEM_1 = {"name": "Item 1", "price": "$1.00"}
+ITEM_2 = {"name": "Item 2", "price": "$2.50"}
+DISCOUNT = {"description": "Promo", "price": "-$0.50"}
+
+
+def _snapshot(items, transaction_discounts=(), total="0.00"):
+    return JournalSnapshot(
+        items=list(items),
+        transaction_discounts=list(transaction_discounts),
+        total_amount={"total": total, "basket_count": len(items)},
+    )
+
+
+class TestJournalSnapshot:
+
+    def test_diff_after_adding_a_row(self):
+        previous = _snapshot([ITEM_1], total="1.00")
+        current = _snapshot([ITEM_1, ITEM_2], total="3.50")
+
+        changes = current.diff(previous)
+
+        assert changes["items"] == {"added": [ITEM_2], "removed": [], "changed": []}
+        assert changes["transaction_discounts"] == {"added": [], "removed": [], "changed": []}
+        assert changes["total_amount"] == {
+            "before": {"total": "1.00", "basket_count": 1},
+            "after": {"total": "3.50", "basket_count": 2},
+        }
+
+    def test_diff_after_removing_a_row(self):
+        previous = _snapshot([ITEM_1, ITEM_2], [DISCOUNT], total="3.00")
+        current = _snapshot([ITEM_1, ITEM_2], total="3.50")
+
+        changes = current.diff(previous)
+
+        assert changes["items"] == {"added": [], "removed": [], "changed": []}
+        assert changes["transaction_discounts"] == {"added": [], "removed": [DISCOUNT], "changed": []}
+
+    def test_diff_reports_changed_rows_by_index(self):
+        repriced = {"name": "Item 2", "price": "$3.00"}
+        previous = _snapshot([ITEM_1, ITEM_2], total="3.50")
+        current = _snapshot([ITEM_1, repriced], total="3.50")
+
+        changes = current.diff(previous)
+
+        assert changes["items"]["changed"] == [{"index": 2, "before": ITEM_2, "after": repriced}]
+        assert "total_amount" not in changes
+
+    def test_merge_rows_takes_unchanged_rows_from_the_previous_snapshot(self):
+        scraped = [{"hash": "a", "row": None}, {"hash": "b", "row": ITEM_2}]
+
+        assert _merge_rows(scraped, [ITEM_1]) == [ITEM_1, ITEM_2]
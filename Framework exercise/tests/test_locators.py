@@ -0,0 +1,56 @@
+from hornets.base_enum import BaseEnum
+from hornets.utilities.locators import compile_locator, resolve_xpath
+
+
+class SampleLocators(BaseEnum):
+    ROW_CELL = "//div[@id='journal']//tr[{}]/td[@class='name']"
+    ROW_CELL_SPACED = "//div[@id='journal']//tr[ {} ]/td[@class='price']"
+    NAMED_BUTTON = "//button[normalize-space()='{}']"
+    PROMPT_WITH_AMOUNT = "//div[@id='{}']//span[contains(text(), '{}')]"
+    STATIC_TITLE = "//h1[@class='title']"
+    TUPLE_ROW_CELL = ("xpath", "//table//tr[{}]/td[2]")
+
+
+class TestCompileLocator:
+
+    def test_positional_template_also_compiles_to_all_rows(self):
+        compiled = compile_locator(SampleLocators.ROW_CELL)
+
+        assert compiled.all_rows == "//div[@id='journal']//tr/td[@class='name']"
+        assert compiled.resolve("3") == "//div[@id='journal']//tr[3]/td[@class='name']"
+
+    def test_positional_predicate_with_spaces(self):
+        compiled = compile_locator(SampleLocators.ROW_CELL_SPACED)
+
+        assert compiled.all_rows == "//div[@id='journal']//tr/td[@class='price']"
+        assert compiled.resolve("2") == "//div[@id='journal']//tr[ 2 ]/td[@class='price']"
+
+    def test_non_positional_template_has_no_all_rows(self):
+        compiled = compile_locator(SampleLocators.NAMED_BUTTON)
+
+        assert compiled.all_rows is None
+        assert compiled.resolve("Sign On") == "//button[normalize-space()='Sign On']"
+
+    def test_template_with_several_placeholders_fills_them_all(self):
+        compiled = compile_locator(SampleLocators.PROMPT_WITH_AMOUNT)
+
+        assert compiled.all_rows is None
+        assert compiled.resolve("prompt") == "//div[@id='prompt']//span[contains(text(), 'prompt')]"
+
+    def test_template_without_placeholder_ignores_additional_attribute(self):
+        compiled = compile_locator(SampleLocators.STATIC_TITLE)
+
+        assert compiled.resolve() == compiled.resolve("ignored") == "//h1[@class='title']"
+
+    def test_tuple_valued_locator_uses_its_xpath(self):
+        compiled = compile_locator(SampleLocators.TUPLE_ROW_CELL)
+
+        assert compiled.template == "//table//tr[{}]/td[2]"
+        assert compiled.all_rows == "//table//tr/td[2]"
+        assert resolve_xpath(SampleLocators.TUPLE_ROW_CELL, "4") == "//table//tr[4]/td[2]"
+
+    def test_template_is_kept_without_additional_attribute(self):
+        assert resolve_xpath(SampleLocators.ROW_CELL) == "//div[@id='journal']//tr[{}]/td[@class='name']"
+
+    def test_locators_are_compiled_once(self):
+        assert compile_locator(SampleLocators.NAMED_BUTTON) is compile_locator(SampleLocators.NAMED_BUTTON)
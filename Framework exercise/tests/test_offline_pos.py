@@ -0,0 +1,121 @@
+import pytest
+
+from hornets.components.offline_backend import OfflineCard, SimulatorLatencies, build_offline_pos
+from hornets.components.pos.enums import PayMode
+from hornets.components.pos.payment.payment import Payment
+from hornets.components.pos.payment.payment_method import CreditCardPaymentMethod, DebitCardPaymentMethod
+from hornets.components.transaction.enums import WatermarkDisplay
+
+
+@pytest.fixture
+def offline():
+    offline = build_offline_pos(SimulatorLatencies(pinpad_ready=0.1, authorization=0.05))
+    offline.pos.reset()
+    return offline
+
+
+class TestOfflinePos:
+
+    def test_credit_card_payment(self, offline):
+        offline.pos.select_item(item="Item 1")
+
+        transaction = offline.pos.pay(Payment(CreditCardPaymentMethod(OfflineCard("VISA"))))
+
+        assert [name for name, _ in offline.simulator.card_reads] == ["VISA"]
+        assert offline.simulator.balance == 0
+        assert transaction["watermark"] == WatermarkDisplay.TRANSACTION_COMPLETED
+        assert offline.simulator.last_receipt()["total"] == "$1.00"
+
+    def test_split_tender_with_partial_approval(self, offline):
+        offline.simulator.catalog["Item 1"] = 2.0
+        offline.pos.select_item(item="Item 1")
+
+        transaction = offline.pos.pay(Payment(
+            CreditCardPaymentMethod(OfflineCard("VISA", approved_limit=0.5), credit_card_limit="0.50"),
+            DebitCardPaymentMethod(OfflineCard("DEBIT")),
+        ))
+
+        assert [name for name, _ in offline.simulator.card_reads] == ["VISA", "DEBIT"]
+        assert offline.simulator.prompt is None
+        assert offline.simulator.paid_amount == 2.0
+        assert transaction["watermark"] == WatermarkDisplay.TRANSACTION_COMPLETED
+
+    def test_zero_amount_transaction(self, offline):
+        offline.simulator.catalog["Item 1"] = 0.0
+        offline.pos.select_item(item="Item 1")
+
+        transaction = offline.pos.pay(None, pay_mode=PayMode.ZERO_AMOUNT_TRANSACTION)
+
+        assert offline.simulator.card_reads == []
+        assert transaction["watermark"] == WatermarkDisplay.TRANSACTION_COMPLETED
+        assert offline.simulator.last_receipt()["total"] == "$0.00"
+
+    def test_snapshot_diff_round_trip(self, offline):
+        offline.pos.select_item(item="Item 1")
+        previous = offline.pos.transaction.snapshot()
+        offline.simulator.catalog["Item 2"] = 2.5
+        offline.pos.select_item(item="Item 2")
+
+        current = offline.pos.transaction.snapshot()
+
+        assert current.diff(previous) == {
+            "items": {"added": [{"name": "Item 2", "price": "$2.50"}], "removed": [], "changed": []},
+            "transaction_discounts": {"added": [], "removed": [], "changed": []},
+            "total_amount": {
+                "before": {"total": "1.00", "basket_count": 1},
+                "after": {"total": "3.50", "basket_count": 2},
+            },
+        }
+        assert current.diff(current) == {
+            "items": {"added": [], "removed": [], "changed": []},
+            "transaction_discounts": {"added": [], "removed": [], "changed": []},
+        }
+
+    def test_pipelined_split_tender_prepares_ahead_and_keeps_tender_order(self, offline):
+        offline.pos.select_item(item="Item 1")
+        credit_card = OfflineCard("VISA", approved_limit=0.5, preparation_time=0.2)
+        debit_card = OfflineCard("DEBIT", preparation_time=0.2)
+
+        transaction = offline.pos.pay(Payment(
+            CreditCardPaymentMethod(credit_card, credit_card_limit="0.50"),
+            DebitCardPaymentMethod(debit_card),
+            pipelined=True,
+        ))
+
+        assert [name for name, _ in offline.simulator.card_reads] == ["VISA", "DEBIT"]
+        credit_card_read = offline.simulator.card_reads[0][1]
+        assert debit_card.preparation_started < credit_card_read
+        assert offline.simulator.balance == 0
+        assert transaction["watermark"] == WatermarkDisplay.TRANSACTION_COMPLETED
+
+    def test_total_amount_is_read_again_while_the_journal_re_renders(self, offline, monkeypatch):
+        offline.pos.select_item(item="Item 1")
+        execute_batch = offline.driver._execute_batch
+        batches = []
+
+        def re_rendering_batch(commands: list) -> dict:
+            batches.append(commands)
+            if len(batches) == 1:
+                return {"missing": None, "results": [None] * len(commands)}
+            return execute_batch(commands)
+        monkeypatch.setattr(offline.driver, "_execute_batch", re_rendering_batch)
+
+        total_amount = offline.pos.transaction._get_transaction_total_amount()
+
+        journal = offline.simulator.journal()
+        assert total_amount == {"total": journal["total"].replace("$", ""), "basket_count": int(journal["basket_count"])}
+
+    @pytest.mark.parametrize("payment_method, prompts_checked", [
+        (CreditCardPaymentMethod(OfflineCard("VISA")), False),
+        (CreditCardPaymentMethod(OfflineCard("VISA", approved_limit=0.5), credit_card_limit="0.50"), True),
+    ])
+    def test_prompts_are_checked_only_after_tenders_that_may_prompt(
+            self, offline, monkeypatch, payment_method, prompts_checked
+    ):
+        checks = []
+        monkeypatch.setattr(offline.pos, "_check_for_additional_prompts", lambda *args: checks.append(args))
+        offline.pos.select_item(item="Item 1")
+
+        offline.pos.pay(Payment(payment_method, DebitCardPaymentMethod(OfflineCard("DEBIT"))))
+
+        assert bool(checks) == prompts_checked
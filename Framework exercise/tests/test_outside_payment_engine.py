@@ -0,0 +1,48 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from hornets.components.pos.outside_payment_engine import OutsidePaymentEngine
+
+
+class FakeCrind:
+    def __init__(self, flow_duration: float):
+        self.flow_duration = flow_duration
+        self.transaction = SimpleNamespace(transaction_details=None)
+        self.flows_run = 0
+
+
+class FakeOutsidePayment:
+    def make_outside_payment(self, crind: FakeCrind):
+        time.sleep(crind.flow_duration)
+        crind.flows_run += 1
+
+
+class TestOutsidePaymentEngine:
+
+    def test_timeout_does_not_count_time_waiting_for_a_connection(self):
+        crinds = {dispenser: FakeCrind(flow_duration=0.3) for dispenser in ("d1", "d2", "d3")}
+        engine = OutsidePaymentEngine(crinds, connections=1, timeout=0.5)
+
+        report = engine.run_sync(FakeOutsidePayment, rounds=2)
+
+        assert [result.error for result in report.results] == [None] * 6
+        assert all(crind.flows_run == 2 for crind in crinds.values())
+        assert report.abandoned == []
+
+    def test_hung_flow_times_out_and_is_abandoned(self):
+        release = threading.Event()
+
+        class HungOutsidePayment:
+            def make_outside_payment(self, crind):
+                release.wait(5)
+
+        engine = OutsidePaymentEngine({"d1": FakeCrind(flow_duration=0)}, connections=1, timeout=0.1)
+        try:
+            report = engine.run_sync(HungOutsidePayment, rounds=3)
+        finally:
+            release.set()
+
+        assert [result.error for result in report.results] == ["timeout"]
+        assert report.abandoned == ["d1"]
+        assert report.to_dict()["errors"] == 1
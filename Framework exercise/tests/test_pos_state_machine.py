@@ -0,0 +1,109 @@
+import pytest
+
+from hornets.components.pos.enums import PosStateName
+from hornets.components.pos.pos_state_machine import (
+    STRICT_STATE_ENV_VAR,
+    InvalidPosStateException,
+    PosLifecycleState,
+    PosStateMachine,
+)
+
+
+@pytest.fixture
+def state_machine():
+    state_machine = PosStateMachine(strict=True)
+    state_machine.reset()
+    return state_machine
+
+
+class TestPosStateMachine:
+
+    def test_card_transaction_goes_through_the_allowed_transitions(self, state_machine):
+        for state in (
+                PosStateName.IN_TRANSACTION,
+                PosStateName.IN_TRANSACTION_SELECTING_TENDER,
+                PosStateName.IN_TRANSACTION_AFTER_PAYMENT,
+                PosLifecycleState.TRANSACTION_COMPLETED,
+                PosLifecycleState.IDLE,
+        ):
+            state_machine.transition(state)
+
+        assert state_machine.state == PosLifecycleState.IDLE
+
+    def test_zero_amount_transaction_completes_from_in_transaction(self, state_machine):
+        state_machine.transition(PosStateName.IN_TRANSACTION)
+        state_machine.transition(PosLifecycleState.TRANSACTION_COMPLETED)
+
+        assert state_machine.state == PosLifecycleState.TRANSACTION_COMPLETED
+
+    def test_strict_mode_rejects_disallowed_transition(self, state_machine):
+        with pytest.raises(InvalidPosStateException):
+            state_machine.transition(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+
+    def test_lenient_mode_allows_disallowed_transition(self):
+        state_machine = PosStateMachine(strict=False)
+        state_machine.reset()
+
+        state_machine.transition(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+
+        assert state_machine.state == PosStateName.IN_TRANSACTION_AFTER_PAYMENT
+
+    def test_unknown_state_allows_any_transition(self):
+        state_machine = PosStateMachine(strict=True)
+
+        state_machine.transition(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+
+        assert state_machine.state == PosStateName.IN_TRANSACTION_AFTER_PAYMENT
+
+    def test_strict_mode_verifies_the_pos_screen(self):
+        state_machine = PosStateMachine(verifiers={PosStateName.IN_TRANSACTION: lambda: False}, strict=True)
+        state_machine.reset()
+
+        with pytest.raises(InvalidPosStateException):
+            state_machine.transition(PosStateName.IN_TRANSACTION)
+
+    def test_verifiers_are_not_run_outside_strict_mode(self):
+        verified = []
+        state_machine = PosStateMachine(
+            verifiers={PosStateName.IN_TRANSACTION: lambda: verified.append(True)}, strict=False
+        )
+
+        state_machine.transition(PosStateName.IN_TRANSACTION)
+
+        assert verified == []
+
+    def test_strict_mode_from_environment(self, monkeypatch):
+        monkeypatch.setenv(STRICT_STATE_ENV_VAR, "1")
+        assert PosStateMachine().strict
+        monkeypatch.setenv(STRICT_STATE_ENV_VAR, "0")
+        assert not PosStateMachine().strict
+
+    def test_requires(self, state_machine):
+        state_machine.transition(PosStateName.IN_TRANSACTION)
+
+        state_machine.requires(PosStateName.IN_TRANSACTION, PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+        with pytest.raises(InvalidPosStateException):
+            state_machine.requires(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+
+    def test_unknown_state_satisfies_any_precondition(self):
+        PosStateMachine(strict=True).requires(PosStateName.IN_TRANSACTION_AFTER_PAYMENT)
+
+    def test_prompt_sources_are_consumed_once(self, state_machine):
+        assert not state_machine.consume_prompt_sources()
+
+        state_machine.note_prompt_source("pay")
+
+        assert state_machine.consume_prompt_sources()
+        assert not state_machine.consume_prompt_sources()
+
+    def test_prompt_is_possible_while_the_state_is_unknown(self):
+        assert PosStateMachine().consume_prompt_sources()
+
+    def test_reset_goes_back_to_idle_and_forgets_prompt_sources(self, state_machine):
+        state_machine.transition(PosStateName.IN_TRANSACTION)
+        state_machine.note_prompt_source("select_item")
+
+        state_machine.reset()
+
+        assert state_machine.state == PosLifecycleState.IDLE
+        assert not state_machine.consume_prompt_sources()
@@ -0,0 +1,53 @@
+import json
+
+from hornets.components.transaction.transaction_details import TransactionDetails
+from hornets.components.transaction.transaction_export import TransactionRecordWriter
+
+
+class CardTender:
+    def __str__(self):
+        return "Credit card"
+
+
+class TestTransactionDetails:
+
+    def test_to_dict_does_not_mutate_payment_method(self):
+        details = TransactionDetails()
+        payment_method = ("Credit card",)
+        details.payment_method = payment_method
+
+        transaction = details.to_dict()
+
+        assert transaction["payment_method"] == "Credit card"
+        assert details.payment_method is payment_method
+        assert details.to_dict() == transaction
+
+    def test_to_dict_keeps_split_tender_payment_methods(self):
+        details = TransactionDetails()
+        details.payment_method = ("Credit card", "Debit card")
+
+        assert details.to_dict()["payment_method"] == ("Credit card", "Debit card")
+
+
+class TestTransactionRecordWriter:
+
+    def test_records_are_appended_as_json_lines(self, tmp_path):
+        path = tmp_path / "records" / "transactions.jsonl"
+        with TransactionRecordWriter(path) as writer:
+            writer.write({"receipt": 1, "total": "1.00"})
+        with TransactionRecordWriter(path) as writer:
+            writer.write({"receipt": 2, "total": "2.50"})
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"receipt": 1, "total": "1.00"},
+            {"receipt": 2, "total": "2.50"},
+        ]
+        assert writer.records_written == 1
+
+    def test_values_that_are_not_json_types_are_written_as_strings(self, tmp_path):
+        path = tmp_path / "transactions.jsonl"
+        with TransactionRecordWriter(path) as writer:
+            writer.write({"payment_method": CardTender()})
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"payment_method": "Credit card"}